@@ -44,6 +44,23 @@ a = Analysis(
         'splash_screen',
         'opencv_video_player',
         'embedded_video_player',
+        'frame_buffer',
+        'presentation_clock',
+        'gl_video_surface',
+        'decoder_backends',
+        'frame_sources',
+        'clip_cache',
+        'prerender',
+        'seek_index',
+        'load_governor',
+        'renderer_process',
+        'media_probe',
+        'thumbnail_service',
+        'image_loader',
+        'image_cache',
+        'content_presenters',
+        'command_queue',
+        'PyQt5.QtNetwork',
     ],
     hookspath=[],
     hooksconfig={},
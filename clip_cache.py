@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+短视频解码帧缓存
+循环播放的短视频第一遍解码时按显示分辨率录入帧存储（内存或磁盘映射文件），
+之后的循环和其他屏幕直接从存储回放，不再解码；全局字节预算，按LRU淘汰，
+仍在回放的帧存储按引用计数延迟到最后一个屏幕释放时才真正释放
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+CLIP_CACHE_DIR = os.path.join("cache", "clips")
+
+STORAGE_RAM = "ram"
+STORAGE_MEMMAP = "memmap"
+
+
+class DecodedClip:
+    """一段完整解码的视频帧存储"""
+
+    def __init__(self, key, frames, fps, path=None):
+        self.key = key
+        self.frames = frames      # (帧数, 高, 宽, 3) uint8，ndarray或np.memmap
+        self.fps = fps
+        self.path = path          # 磁盘映射文件路径，内存存储时为None
+        self.frame_count = len(frames)
+        self.refs = 1             # 持有该帧存储的帧源数（录入者或回放者）
+        self.cached = False       # 是否在缓存中（可被新的屏幕命中）
+
+    @property
+    def nbytes(self):
+        return self.frame_count * self.frames[0].nbytes if self.frame_count else 0
+
+    def truncate(self, frame_count):
+        """实际帧数少于CAP_PROP_FRAME_COUNT时截断"""
+        self.frames = self.frames[:frame_count]
+        self.frame_count = frame_count
+
+
+class ClipCache:
+    """进程内共享的短视频帧缓存"""
+
+    def __init__(self, budget_bytes=512 * 1024 * 1024, max_duration=15.0, storage=STORAGE_RAM):
+        self.enabled = False
+        self.budget_bytes = budget_bytes
+        self.max_duration = max_duration  # 只缓存不超过该时长（秒）的视频
+        self.storage = storage
+
+        self._lock = threading.Lock()
+        self._clips = OrderedDict()   # key -> DecodedClip，按最近使用排序
+        self._recording = set()       # 正在录入的key，避免多个屏幕重复录入
+        self.used_bytes = 0
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, enabled, budget_mb=None, storage=None):
+        """应用设置；关闭或缩小预算时立即淘汰超出部分"""
+        with self._lock:
+            self.enabled = bool(enabled)
+            if budget_mb is not None:
+                self.budget_bytes = int(budget_mb * 1024 * 1024)
+            if storage is not None:
+                self.storage = storage
+            self._evict(0 if not self.enabled else self.budget_bytes)
+
+    def make_key(self, video_path, display_size):
+        """缓存键：路径 + 修改时间 + 显示分辨率"""
+        try:
+            mtime = os.path.getmtime(video_path)
+        except OSError:
+            mtime = 0
+        return (os.path.normcase(os.path.abspath(video_path)), mtime, tuple(display_size or ()))
+
+    def lookup(self, key):
+        """查找已完成的帧存储，命中时移到LRU末尾并增加引用，用完后须调用release()；
+        未命中不在这里计数：调用方此时还不知道视频是否符合缓存条件，由begin_record()计入"""
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is None:
+                return None
+            self._clips.move_to_end(key)
+            clip.refs += 1
+            self.hits += 1
+            return clip
+
+    def begin_record(self, key, frame_count, frame_shape, fps):
+        """为符合条件的短视频分配录入存储（引用归录入者）；超出预算或已有屏幕在录入时返回None"""
+        nbytes = frame_count * int(np.prod(frame_shape))
+        with self._lock:
+            self.misses += 1
+            if not self.enabled or frame_count <= 0 or nbytes > self.budget_bytes or key in self._recording:
+                return None
+            # 预先腾出空间，录入期间的内存也计入预算
+            self._evict(self.budget_bytes - nbytes)
+            self._recording.add(key)
+            self.used_bytes += nbytes
+
+        shape = (frame_count,) + tuple(frame_shape)
+        try:
+            if self.storage == STORAGE_MEMMAP:
+                os.makedirs(CLIP_CACHE_DIR, exist_ok=True)
+                name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+                path = os.path.join(CLIP_CACHE_DIR, f"{name}.raw")
+                frames = np.memmap(path, dtype=np.uint8, mode='w+', shape=shape)
+                return DecodedClip(key, frames, fps, path)
+            return DecodedClip(key, np.empty(shape, dtype=np.uint8), fps)
+        except Exception as e:
+            print(f"分配短视频缓存失败: {e}")
+            with self._lock:
+                self._recording.discard(key)
+                self.used_bytes -= nbytes
+            return None
+
+    def commit(self, clip, frame_count):
+        """录入完成，加入缓存供后续循环和其他屏幕使用；录入者继续持有引用回放"""
+        reserved = clip.nbytes
+        clip.truncate(frame_count)
+        with self._lock:
+            self._recording.discard(clip.key)
+            self.used_bytes += clip.nbytes - reserved
+            if not self.enabled:
+                # 缓存已关闭：不加入缓存，录入者释放后即回收
+                return
+            clip.cached = True
+            self._clips[clip.key] = clip
+            self._clips.move_to_end(clip.key)
+        print(f"短视频已缓存: {os.path.basename(clip.key[0])}，{frame_count}帧，{clip.nbytes / 1024 / 1024:.1f}MB")
+
+    def abort(self, clip):
+        """放弃录入（跳转、读帧异常等）"""
+        with self._lock:
+            self._recording.discard(clip.key)
+        self.release(clip)
+
+    def release(self, clip):
+        """帧源不再使用帧存储；已移出缓存且没有其他屏幕在回放时释放内存与映射文件"""
+        with self._lock:
+            clip.refs -= 1
+            if clip.refs > 0 or clip.cached:
+                return
+            self.used_bytes -= clip.nbytes
+        self._free(clip)
+
+    def _evict(self, target_bytes):
+        """按LRU淘汰直到占用不超过target_bytes；调用方持有锁"""
+        while self._clips and self.used_bytes > target_bytes:
+            _, clip = self._clips.popitem(last=False)
+            clip.cached = False
+            self.evictions += 1
+            if clip.refs > 0:
+                # 仍有屏幕在回放：不再被命中，占用计入预算直到最后一个屏幕释放
+                continue
+            self.used_bytes -= clip.nbytes
+            self._free(clip)
+
+    def _free(self, clip):
+        """释放帧存储：先丢弃数组引用（内存映射随之关闭），再删除映射文件"""
+        clip.frames = None
+        self._remove_file(clip)
+
+    def _remove_file(self, clip):
+        if clip.path:
+            try:
+                os.remove(clip.path)
+            except OSError:
+                # 映射未能关闭时Windows下无法删除，下次启动时覆盖
+                pass
+
+    def get_stats(self):
+        """获取缓存统计"""
+        with self._lock:
+            return {
+                'clip_cache_enabled': self.enabled,
+                'clip_entries': len(self._clips),
+                'clip_bytes': self.used_bytes,
+                'clip_budget_bytes': self.budget_bytes,
+                'clip_hits': self.hits,
+                'clip_misses': self.misses,
+                'clip_evictions': self.evictions,
+            }
+
+
+# 进程内唯一的短视频缓存，由主程序按设置启用
+clip_cache = ClipCache()
+
+
+__all__ = ['ClipCache', 'DecodedClip', 'clip_cache', 'STORAGE_RAM', 'STORAGE_MEMMAP']
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+合并命令队列
+内容窗口的命令按键合并：同一键尚未执行的命令只保留最后一次（后写者胜），各键按首次提交的顺序
+逐条执行；执行中的命令由调用方在异步完成后调用complete()，其间到达的命令排队而不是被丢弃，
+最终状态总会被应用。自动化高频切换时可通过队列深度与命令延迟评估窗口的跟随情况
+"""
+
+import time
+from collections import OrderedDict
+from PyQt5.QtCore import QTimer
+
+
+class CoalescingCommandQueue:
+    """单个窗口的合并命令队列（界面线程使用）"""
+
+    def __init__(self, handler, name=""):
+        self.handler = handler          # handler(键, 参数)，命令完成后须调用complete()
+        self.name = name
+        self._pending = OrderedDict()   # 键 -> (参数, 提交时间)
+        self._in_flight = None          # (键, 提交时间)
+        self._dispatch_scheduled = False
+
+        # 统计信息
+        self.submitted = 0
+        self.coalesced = 0              # 被同键新命令覆盖的命令数
+        self.completed = 0
+        self.total_latency = 0.0        # 提交到完成的累计耗时（秒）
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+        self.peak_depth = 0
+
+    @property
+    def depth(self):
+        """排队中与执行中的命令数"""
+        return len(self._pending) + (1 if self._in_flight is not None else 0)
+
+    def submit(self, key, payload):
+        """提交命令；同键的未执行命令被替换，位置保持不变"""
+        self.submitted += 1
+        if key in self._pending:
+            self.coalesced += 1
+        self._pending[key] = (payload, time.perf_counter())
+        self.peak_depth = max(self.peak_depth, self.depth)
+        self._schedule()
+
+    def complete(self):
+        """当前命令已完成（内容已切换或失败），开始执行下一条"""
+        if self._in_flight is None:
+            return
+        _, submitted = self._in_flight
+        self._in_flight = None
+        latency = time.perf_counter() - submitted
+        self.completed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_latency = latency
+        self._schedule()
+
+    def clear(self):
+        """丢弃尚未执行的命令（窗口关闭时使用）"""
+        self._pending.clear()
+
+    def _schedule(self):
+        # 推迟到事件循环执行，同一轮事件中连续提交的命令先合并
+        if self._in_flight is None and self._pending and not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            QTimer.singleShot(0, self._dispatch)
+
+    def _dispatch(self):
+        self._dispatch_scheduled = False
+        if self._in_flight is not None or not self._pending:
+            return
+        key, (payload, submitted) = self._pending.popitem(last=False)
+        self._in_flight = (key, submitted)
+        try:
+            self.handler(key, payload)
+        except Exception as e:
+            print(f"命令执行失败 {self.name} {key}: {e}")
+            self.complete()
+
+    def get_stats(self):
+        """获取队列统计"""
+        return {
+            'queue_depth': self.depth,
+            'queue_peak_depth': self.peak_depth,
+            'queue_submitted': self.submitted,
+            'queue_coalesced': self.coalesced,
+            'queue_completed': self.completed,
+            'queue_avg_latency_ms': round(self.total_latency * 1000 / self.completed, 1) if self.completed else 0.0,
+            'queue_max_latency_ms': round(self.max_latency * 1000, 1),
+            'queue_last_latency_ms': round(self.last_latency * 1000, 1),
+        }
+
+
+__all__ = ['CoalescingCommandQueue']
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+内容展示器
+内容窗口按类型（文本、图片、视频、网页、提示信息）复用展示控件：控件只创建一次并常驻于
+窗口的QStackedWidget中，切换内容时只更新数据，不再重建控件树、重新解析样式表；
+present()之后内容可显示时发出ready信号，窗口据此在后台缓冲中准备好再切换
+"""
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QUrl, pyqtSignal
+from PyQt5.QtGui import QFont
+from PyQt5.QtWebEngineWidgets import QWebEngineView
+
+from image_loader import image_loader, ImageView
+
+# 视频展示器依赖OpenCV播放器
+try:
+    from opencv_video_player import OpenCVVideoPlayer
+    VIDEO_PRESENTER_AVAILABLE = True
+except Exception:
+    # 与threaded_content_window一致：OpenCV初始化出错时同样视为不可用
+    VIDEO_PRESENTER_AVAILABLE = False
+
+MESSAGE_TYPE = "提示"
+
+# 提示信息样式: 类别 -> (颜色, 字号, 是否粗体)
+MESSAGE_STYLES = {
+    "default": ("#666666", 20, False),
+    "loading": ("#00ffff", 18, False),
+    "error": ("#ff6666", 16, True),
+}
+
+
+class TextPresenter(QLabel):
+    """文本展示器"""
+
+    content_type = "文本"
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignCenter)
+        self.setFont(QFont("Microsoft YaHei", 24, QFont.Bold))
+        self.setStyleSheet("""
+            QLabel {
+                color: #ffffff;
+                background: transparent;
+                border: none;
+            }
+        """)
+        self.setWordWrap(True)
+
+    def present(self, text):
+        self.setText(text)
+        self.ready.emit()
+
+    def reset(self):
+        self.clear()
+
+
+class MessagePresenter(QLabel):
+    """提示信息展示器（等待内容、加载中、错误）"""
+
+    content_type = MESSAGE_TYPE
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignCenter)
+        self.setWordWrap(True)
+        self.kind = None
+
+    def present(self, text, kind="default"):
+        if kind != self.kind:
+            # 只在类别变化时更新字体与样式表
+            color, size, bold = MESSAGE_STYLES[kind]
+            self.setFont(QFont("Microsoft YaHei", size, QFont.Bold if bold else QFont.Normal))
+            self.setStyleSheet(f"QLabel {{ color: {color}; background: transparent; border: none; }}")
+            self.kind = kind
+        self.setText(text)
+        self.ready.emit()
+
+    def reset(self):
+        self.clear()
+
+
+class ImagePresenter(ImageView):
+    """图片展示器：命中图片缓存时立即显示，否则在后台解码"""
+
+    content_type = "图片"
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignCenter)
+        self.setStyleSheet("QLabel { background: transparent; border: none; }")
+        self._ticket = None
+        image_loader().imageReady.connect(self._on_image_ready)
+        image_loader().imageFailed.connect(self._on_image_failed)
+
+    def present(self, image_path, target_size):
+        self._ticket = None
+        image = image_loader().cached(image_path, target_size)
+        if image is not None:
+            self.set_image(image)
+            self.ready.emit()
+        else:
+            self.clear_image()
+            self._ticket = image_loader().load(image_path, target_size)
+
+    def reset(self):
+        # 丢弃尚未返回的解码结果
+        self._ticket = None
+        self.clear_image()
+
+    def _on_image_ready(self, ticket, image):
+        if ticket == self._ticket:
+            self._ticket = None
+            self.set_image(image)
+            self.ready.emit()
+
+    def _on_image_failed(self, ticket, message):
+        if ticket == self._ticket:
+            self._ticket = None
+            self.failed.emit(message)
+
+
+class VideoPresenter(QWidget):
+    """视频展示器：复用OpenCV播放器，每次切换以预卷方式打开新视频"""
+
+    content_type = "视频"
+    ready = pyqtSignal()           # 首帧已到达显示表面
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.player = OpenCVVideoPlayer()
+        self.player.firstFrameReady.connect(self.ready)
+        self.player.prerollFailed.connect(self.failed)
+        layout.addWidget(self.player)
+
+    def present(self, video_path, span_tile=None, size=None):
+        """预卷播放视频；span_tile为 (画布尺寸, 分块矩形) 时按拼接分块铺满显示"""
+        if span_tile:
+            # 拼接模式铺满整屏，不留边距
+            self.player.layout().setContentsMargins(0, 0, 0, 0)
+            self.player.set_span_tile(*span_tile)
+        else:
+            self.player.layout().setContentsMargins(2, 2, 2, 2)
+            self.player.set_span_tile(None, None)
+        self.player.preroll(video_path, size)
+
+    def reset(self):
+        self.player.stop_video()
+
+
+class WebPresenter(QWebEngineView):
+    """网页展示器"""
+
+    content_type = "网页"
+    ready = pyqtSignal()           # 页面首次加载完成（成功与否由页面自身显示）
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._awaiting_load = False
+        self.loadFinished.connect(self._on_load_finished)
+
+    def present(self, url):
+        self._awaiting_load = True
+        if url.startswith(('http://', 'https://')):
+            self.load(QUrl(url))
+        else:
+            self.load(QUrl('https://' + url))
+
+    def reset(self):
+        # 空闲时卸载页面，停止脚本与媒体
+        self._awaiting_load = False
+        self.stop()
+        self.setUrl(QUrl("about:blank"))
+
+    def _on_load_finished(self, ok):
+        # 忽略reset()卸载页面产生的完成事件
+        if self._awaiting_load and self.url().toString() != "about:blank":
+            self._awaiting_load = False
+            self.ready.emit()
+
+
+PRESENTER_TYPES = {
+    TextPresenter.content_type: TextPresenter,
+    MessagePresenter.content_type: MessagePresenter,
+    ImagePresenter.content_type: ImagePresenter,
+    WebPresenter.content_type: WebPresenter,
+}
+if VIDEO_PRESENTER_AVAILABLE:
+    PRESENTER_TYPES[VideoPresenter.content_type] = VideoPresenter
+
+
+class PresenterPool:
+    """单个窗口的展示器池：按类型借出空闲展示器，没有时才创建并加入stack"""
+
+    def __init__(self, stack, presenter_types=None):
+        self.stack = stack
+        self.presenter_types = presenter_types or PRESENTER_TYPES
+        self._idle = {}
+
+        # 统计信息
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, content_type):
+        """借出一个展示器，返回 (展示器, 是否新建)"""
+        idle = self._idle.setdefault(content_type, [])
+        if idle:
+            self.reused += 1
+            return idle.pop(), False
+        presenter = self.presenter_types[content_type]()
+        self.stack.addWidget(presenter)
+        self.created += 1
+        return presenter, True
+
+    def release(self, presenter):
+        """归还展示器：清空内容后留在stack中等待下次使用"""
+        presenter.reset()
+        idle = self._idle.setdefault(presenter.content_type, [])
+        if presenter not in idle:
+            idle.append(presenter)
+
+    def get_stats(self):
+        """获取展示器池统计"""
+        return {
+            'presenters_created': self.created,
+            'presenters_reused': self.reused,
+            'presenters_idle': sum(len(idle) for idle in self._idle.values()),
+        }
+
+
+__all__ = ['PresenterPool', 'TextPresenter', 'MessagePresenter', 'ImagePresenter', 'VideoPresenter',
+           'WebPresenter', 'PRESENTER_TYPES', 'MESSAGE_TYPE', 'VIDEO_PRESENTER_AVAILABLE']
@@ -2,13 +2,15 @@ import os
 import json
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTextEdit, QHBoxLayout, 
                              QPushButton, QApplication, QFrame, QGraphicsDropShadowEffect)
-from PyQt5.QtCore import Qt, QUrl, QTimer, QPoint, QRect, pyqtSignal, QThread, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QPixmap, QFont, QColor, QCursor, QPainter
+from PyQt5.QtCore import Qt, QUrl, QTimer, QPoint, QRect, QSize, pyqtSignal, QThread, QPropertyAnimation, QEasingCurve
+from PyQt5.QtGui import QFont, QColor, QCursor, QPainter
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
 from video_player_alternatives import AlternativeVideoPlayer
 from embedded_video_player import EmbeddedVideoPlayer
+from media_probe import media_probe
+from image_loader import image_loader, ImageView
 
 # 尝试导入OpenCV播放器
 try:
@@ -110,6 +112,12 @@ class OptimizedContentContainer(QWidget):
         self.media_player = None
         self.web_view = None
         
+        # 后台解码中的图片：显示控件与请求号
+        self.image_view = None
+        self._image_ticket = None
+        image_loader().imageReady.connect(self._on_image_ready)
+        image_loader().imageFailed.connect(self._on_image_failed)
+        
         # 窗口状态
         self.is_maximized = False
         self.is_fullscreen = False
@@ -344,33 +352,29 @@ class OptimizedContentContainer(QWidget):
             self.show_error_fast("图片文件未找到")
             
     def _load_image_async(self, image_path):
-        """异步加载图片"""
-        try:
-            image_widget = QWidget()
-            image_layout = QVBoxLayout(image_widget)
-            image_layout.setAlignment(Qt.AlignCenter)
-            
-            image_label = QLabel()
-            pixmap = QPixmap(image_path)
-            
-            if not pixmap.isNull():
-                # 限制图片大小，提升性能
-                max_size = min(self.width() - 40, 800)  # 最大800px
-                scaled_pixmap = pixmap.scaled(
-                    max_size,
-                    max_size,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                image_label.setPixmap(scaled_pixmap)
-                image_label.setAlignment(Qt.AlignCenter)
-                image_layout.addWidget(image_label)
-                
-                self.content_layout.addWidget(image_widget)
-            else:
-                self.show_error_fast("图片格式不支持")
-        except Exception as e:
-            self.show_error_fast(f"图片加载失败: {str(e)}")
+        """异步加载图片 - 固定按800px上限解码并缓存，显示时再按窗口尺寸缩小"""
+        self.image_view = ImageView()
+        self.image_view.setAlignment(Qt.AlignCenter)
+        self.content_layout.addWidget(self.image_view)
+        # 解码尺寸与窗口宽度无关，不同窗口和重复应用配置都能命中同一缓存项
+        target_size = QSize(800, 800)
+        image = image_loader().cached(image_path, target_size)
+        if image is not None:
+            self.image_view.set_image(image)
+        else:
+            self._image_ticket = image_loader().load(image_path, target_size)
+            
+    def _on_image_ready(self, ticket, image):
+        """后台解码完成，只接受当前图片的结果"""
+        if ticket == self._image_ticket and self.image_view is not None:
+            self._image_ticket = None
+            self.image_view.set_image(image)
+            
+    def _on_image_failed(self, ticket, message):
+        if ticket == self._image_ticket:
+            self._image_ticket = None
+            self.clear_content()
+            self.show_error_fast(f"图片加载失败: {message}")
             
     def set_video_content_fast(self, video_path):
         """快速视频内容设置 - 使用多种播放方案"""
@@ -390,13 +394,10 @@ class OptimizedContentContainer(QWidget):
         
         if os.path.exists(video_path):
             try:
-                # 检查文件是否可读
-                with open(video_path, 'rb') as f:
-                    # 读取前4个字节检查文件头
-                    header = f.read(4)
-                    if len(header) < 4:
-                        self.show_error_fast("视频文件似乎已损坏（文件太小）")
-                        return
+                # 检查文件头（结果随媒体探测缓存，文件未变化时不再读取）
+                if media_probe.check_header(video_path) is None:
+                    self.show_error_fast("视频文件似乎已损坏（文件太小）")
+                    return
                 
                 # 清理之前的播放器
                 self.clear_video_content()
@@ -602,6 +603,10 @@ class OptimizedContentContainer(QWidget):
         if hasattr(self, 'embedded_player') and self.embedded_player:
             self.embedded_player.cleanup()
             
+        # 丢弃尚未返回的图片解码结果
+        self.image_view = None
+        self._image_ticket = None
+            
         # 快速清空布局
         for i in reversed(range(self.content_layout.count())):
             child = self.content_layout.itemAt(i).widget()
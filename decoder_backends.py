@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+视频解码后端选择
+按"启用硬件加速"设置尝试 FFMPEG / GStreamer 硬件解码，按编码格式缓存可用组合，
+不可用时透明回退到软件解码并记录原因
+"""
+
+import os
+import json
+import time
+import threading
+import cv2
+
+from media_probe import media_probe
+
+CACHE_DIR = "cache"
+CAPABILITY_CACHE_FILE = os.path.join(CACHE_DIR, "decoder_capabilities.json")
+# "无可用硬件解码"的记录有效期（秒）；驱动或OpenCV升级后需要重新探测
+NEGATIVE_ENTRY_TTL = 7 * 24 * 3600
+
+# 由主程序根据settings.json中的hardware_acceleration设置
+_hardware_acceleration = True
+
+
+def set_hardware_acceleration(enabled):
+    """设置是否尝试硬件解码"""
+    global _hardware_acceleration
+    _hardware_acceleration = bool(enabled)
+
+
+def get_hardware_acceleration():
+    """当前是否尝试硬件解码（传给解码子进程）"""
+    return _hardware_acceleration
+
+
+def fourcc_to_codec(fourcc):
+    """把CAP_PROP_FOURCC的数值转换为编码名称，如 'avc1'"""
+    code = int(fourcc)
+    if code <= 0:
+        return "unknown"
+    chars = [chr((code >> (8 * i)) & 0xFF) for i in range(4)]
+    codec = "".join(chars).strip().lower()
+    return codec if codec.isprintable() and codec else "unknown"
+
+
+class DecoderCapabilityCache:
+    """按编码格式记录可用的解码后端组合，持久化到磁盘"""
+
+    def __init__(self, path=CAPABILITY_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._entries = json.load(f)
+            except Exception as e:
+                print(f"加载解码能力缓存失败: {e}")
+
+    def get(self, codec):
+        """查询编码格式的可用后端；过期或由其他OpenCV版本写入的"不可用"记录视为未知"""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(codec)
+            if entry is not None and entry['backend'] is None:
+                if (entry.get('opencv') != cv2.__version__
+                        or time.time() - entry.get('checked', 0) > NEGATIVE_ENTRY_TTL):
+                    return None
+            return entry
+
+    def put(self, codec, backend, reason=""):
+        """记录编码格式的可用后端；backend为None表示只能软件解码"""
+        with self._lock:
+            self._load()
+            self._entries[codec] = {'backend': backend, 'reason': reason,
+                                    'opencv': cv2.__version__, 'checked': time.time()}
+            self._save()
+
+    def invalidate(self, codec):
+        """删除编码格式的记录，下次打开时重新探测"""
+        with self._lock:
+            self._load()
+            if self._entries.pop(codec, None) is not None:
+                self._save()
+
+    def _save(self):
+        """写入磁盘；调用方持有锁"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存解码能力缓存失败: {e}")
+
+
+capability_cache = DecoderCapabilityCache()
+
+
+def _hw_candidates():
+    """当前OpenCV构建中可用的硬件解码后端候选（名称, API常量）"""
+    candidates = []
+    for name in ("FFMPEG", "GSTREAMER"):
+        api = getattr(cv2, f"CAP_{name}", None)
+        if api is None:
+            continue
+        try:
+            if not cv2.videoio_registry.hasBackend(api):
+                continue
+        except AttributeError:
+            pass
+        candidates.append((name, api))
+    return candidates
+
+
+def _try_hw_open(video_path, api):
+    """尝试以指定后端打开硬件解码，成功返回已就绪的capture，否则返回None"""
+    params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+    cap = cv2.VideoCapture(video_path, api, params)
+    if not cap.isOpened():
+        cap.release()
+        return None
+    if int(cap.get(cv2.CAP_PROP_HW_ACCELERATION)) == cv2.VIDEO_ACCELERATION_NONE:
+        cap.release()
+        return None
+    # 能真正解出一帧才算可用，随后回到开头
+    ret, _ = cap.read()
+    if not ret:
+        cap.release()
+        return None
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    return cap
+
+
+def _open_hw_backend(video_path, codec, name, api):
+    """以指定后端打开硬件解码，失败（含异常）时返回None"""
+    try:
+        return _try_hw_open(video_path, api)
+    except Exception as e:
+        print(f"硬件解码探测失败 ({codec}, {name}): {e}")
+        return None
+
+
+def open_capture(video_path, hardware_acceleration=None):
+    """打开视频，返回 (capture, 后端描述)；硬件解码不可用时返回软件解码的capture"""
+    if hardware_acceleration is None:
+        hardware_acceleration = _hardware_acceleration
+
+    if not hardware_acceleration:
+        return cv2.VideoCapture(video_path), "software (硬件加速已关闭)"
+    if not hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        print("硬件解码不可用: 当前OpenCV版本不支持CAP_PROP_HW_ACCELERATION（需要4.5.2+）")
+        return cv2.VideoCapture(video_path), "software (OpenCV不支持硬件解码)"
+
+    # 编码格式已由媒体探测缓存记录时，直接按能力缓存中的后端打开，不再先开一次软件解码
+    info = media_probe.get(video_path) or {}
+    codec = info.get('fourcc')
+    cached = capability_cache.get(codec) if codec else None
+    if cached is not None:
+        if cached['backend'] is None:
+            return cv2.VideoCapture(video_path), f"software ({cached['reason']})"
+        api = dict(_hw_candidates()).get(cached['backend'])
+        hw_cap = _open_hw_backend(video_path, codec, cached['backend'], api) if api is not None else None
+        if hw_cap is not None:
+            return hw_cap, f"{cached['backend']} hw"
+        # 缓存的后端本次打开失败：本次使用软件解码，下次重新探测
+        print(f"硬件解码打开失败 ({codec}, {cached['backend']})，使用软件解码")
+        capability_cache.invalidate(codec)
+        return cv2.VideoCapture(video_path), "software"
+
+    # 首次遇到的文件：先用软件解码读出编码格式，再逐个探测硬件后端
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return cap, "software"
+    codec = fourcc_to_codec(cap.get(cv2.CAP_PROP_FOURCC))
+    media_probe.update(video_path, fourcc=codec)
+    cached = capability_cache.get(codec)
+    if cached is not None and cached['backend'] is None:
+        # 该编码已知无可用硬件解码，直接使用已打开的软件capture
+        return cap, f"software ({cached['reason']})"
+
+    candidates = _hw_candidates()
+    if cached is not None:
+        candidates = [c for c in candidates if c[0] == cached['backend']] or candidates
+
+    for name, api in candidates:
+        hw_cap = _open_hw_backend(video_path, codec, name, api)
+        if hw_cap is not None:
+            cap.release()
+            if cached is None or cached['backend'] != name:
+                capability_cache.put(codec, name)
+            print(f"硬件解码已启用: {codec} via {name}")
+            return hw_cap, f"{name} hw"
+
+    reason = "无可用硬件解码后端" if not candidates else f"{'/'.join(c[0] for c in candidates)}均不支持硬件解码"
+    capability_cache.put(codec, None, reason)
+    print(f"硬件解码不可用 ({codec}): {reason}，使用软件解码")
+    return cap, f"software ({reason})"
+
+
+__all__ = ['open_capture', 'set_hardware_acceleration', 'get_hardware_acceleration', 'capability_cache', 'fourcc_to_codec']
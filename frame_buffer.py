@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+帧缓冲与传输
+- FrameRingBuffer: 解码预读环形缓冲区，解码线程提前填充若干帧，展示线程按时钟取帧
+- FramePool: 解码端与渲染端共享的可复用RGB缓冲池，QImage直接包装池内内存
+- FrameMailbox: 播放线程到界面线程的有界信箱，新帧覆盖未取走的旧帧
+"""
+
+import threading
+import numpy as np
+from PyQt5.QtGui import QImage
+
+
+class FrameRingBuffer:
+    """预分配的有界帧环形缓冲区（单生产者/单消费者）"""
+
+    def __init__(self, depth=8, max_bytes=256 * 1024 * 1024):
+        self.requested_depth = max(2, int(depth))
+        self.max_bytes = int(max_bytes)
+        self.depth = 0
+        self.slots = None
+        self.frame_indices = []
+
+        self._cond = threading.Condition()
+        self._read_pos = 0
+        self._write_pos = 0
+        self._count = 0
+        self._reading = False
+        self._closed = False
+
+        # 统计信息
+        self.underruns = 0      # 展示线程取帧时缓冲区为空的次数
+        self.full_waits = 0     # 解码线程因缓冲区已满而等待的次数
+
+    def allocate(self, shape, dtype=np.uint8):
+        """按帧尺寸预分配所有槽位，深度受内存上限约束"""
+        frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        depth = self.requested_depth
+        if frame_bytes * depth > self.max_bytes:
+            depth = max(2, self.max_bytes // max(1, frame_bytes))
+            if frame_bytes * depth > self.max_bytes:
+                print(f"帧缓冲区: 单帧{frame_bytes // 1024}KB，内存上限不足以容纳2帧，仍按2帧分配")
+        with self._cond:
+            self.depth = depth
+            self.slots = np.empty((depth,) + tuple(shape), dtype=dtype)
+            self.frame_indices = [0] * depth
+            self._read_pos = 0
+            self._write_pos = 0
+            self._count = 0
+            self._reading = False
+            self._closed = False
+        print(f"帧缓冲区已分配: {depth}帧 x {frame_bytes // 1024}KB")
+
+    @property
+    def allocated(self):
+        return self.slots is not None
+
+    @property
+    def fill_level(self):
+        """当前已缓冲的帧数"""
+        with self._cond:
+            return self._count
+
+    def wait_fill(self, count, timeout=None):
+        """等待缓冲区至少有count帧（不超过深度），用于预卷；返回是否达到"""
+        with self._cond:
+            count = min(max(1, int(count)), self.depth)
+            self._cond.wait_for(lambda: self._count >= count or self._closed, timeout)
+            return self._count >= count and not self._closed
+            
+    def begin_write(self, timeout=None):
+        """获取下一个可写槽位，缓冲区满时等待；超时或关闭返回None"""
+        with self._cond:
+            if self._count >= self.depth and not self._closed:
+                self.full_waits += 1
+                self._cond.wait_for(lambda: self._count < self.depth or self._closed, timeout)
+            if self._closed or self._count >= self.depth:
+                return None
+            return self.slots[self._write_pos]
+
+    def end_write(self, frame_index):
+        """提交已写入的槽位"""
+        with self._cond:
+            self.frame_indices[self._write_pos] = frame_index
+            self._write_pos = (self._write_pos + 1) % self.depth
+            self._count += 1
+            self._cond.notify_all()
+
+    def begin_read(self, timeout=None):
+        """获取最早的已解码帧 (槽位, 帧号)；缓冲区为空时计一次欠载并等待"""
+        with self._cond:
+            if self._count == 0 and not self._closed:
+                self.underruns += 1
+                self._cond.wait_for(lambda: self._count > 0 or self._closed, timeout)
+            if self._closed or self._count == 0:
+                return None
+            self._reading = True
+            return self.slots[self._read_pos], self.frame_indices[self._read_pos]
+
+    def end_read(self):
+        """归还已读取的槽位"""
+        with self._cond:
+            if not self._reading:
+                return
+            self._reading = False
+            self._read_pos = (self._read_pos + 1) % self.depth
+            self._count -= 1
+            self._cond.notify_all()
+
+    def clear(self):
+        """丢弃所有已缓冲的帧（跳转时使用），正在读取的槽位保留到end_read"""
+        with self._cond:
+            self._count = 1 if self._reading else 0
+            self._write_pos = (self._read_pos + self._count) % max(1, self.depth)
+            self._cond.notify_all()
+
+    def close(self):
+        """关闭缓冲区，唤醒所有等待者"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def get_stats(self):
+        """获取缓冲区统计"""
+        with self._cond:
+            return {
+                'depth': self.depth,
+                'fill': self._count,
+                'underruns': self.underruns,
+                'full_waits': self.full_waits,
+            }
+
+
+class PooledFrame:
+    """池化帧：RGB缓冲区及直接包装它的QImage，显示完毕后必须调用release()"""
+
+    def __init__(self, pool, generation, width, height):
+        self.pool = pool
+        self.generation = generation
+        self.width = width
+        self.height = height
+        self.frame_index = 0
+        self.smooth = True  # 显示端放大时是否使用平滑变换（负载过高时关闭）
+        self.array = np.empty((height, width, 3), dtype=np.uint8)
+        # QImage只引用array的内存，不做复制；array随本对象存活
+        self.image = QImage(self.array.data, width, height, self.array.strides[0], QImage.Format_RGB888)
+        self._released = True
+
+    def release(self):
+        """归还缓冲区，重复调用无副作用"""
+        if not self._released:
+            self._released = True
+            self.pool.release(self)
+
+
+class FramePool:
+    """固定数量的可复用帧缓冲池，尺寸变化时整体重建"""
+
+    def __init__(self, count=4):
+        self.count = max(2, int(count))
+        self._cond = threading.Condition()
+        self._size = None
+        self._generation = 0
+        self._free = []
+
+        # 统计信息
+        self.allocations = 0    # 缓冲区分配次数，稳态播放时不再增长
+        self.exhausted = 0      # 取缓冲区时无空闲的次数（渲染端消费不及时）
+        self.outstanding = 0    # 已借出未归还的数量
+
+    def acquire(self, width, height, timeout=None):
+        """借出一个指定尺寸的缓冲区，无空闲时等待；超时返回None"""
+        with self._cond:
+            if self._size != (width, height):
+                self._resize(width, height)
+            if not self._free:
+                self.exhausted += 1
+                self._cond.wait_for(lambda: self._free, timeout)
+                if not self._free:
+                    return None
+            frame = self._free.pop()
+            frame._released = False
+            self.outstanding += 1
+            return frame
+
+    def release(self, frame):
+        """归还缓冲区；旧尺寸的缓冲区直接丢弃"""
+        with self._cond:
+            self.outstanding -= 1
+            if frame.generation == self._generation:
+                self._free.append(frame)
+                self._cond.notify()
+
+    def _resize(self, width, height):
+        """按新尺寸重建缓冲池，已借出的旧缓冲区归还时作废"""
+        self._generation += 1
+        self._size = (width, height)
+        self._free = [PooledFrame(self, self._generation, width, height) for _ in range(self.count)]
+        self.allocations += self.count
+
+    def get_stats(self):
+        """获取缓冲池统计"""
+        with self._cond:
+            return {
+                'pool_size': self.count,
+                'pool_allocations': self.allocations,
+                'pool_exhausted': self.exhausted,
+                'pool_outstanding': self.outstanding,
+            }
+
+
+class FrameMailbox:
+    """最新帧优先的信箱（深度1-2），界面线程繁忙时旧帧被新帧覆盖并立即归还缓冲池"""
+
+    def __init__(self, depth=1):
+        self.depth = min(2, max(1, int(depth)))
+        self._lock = threading.Lock()
+        self._frames = []
+        self._wake_pending = False
+
+        # 统计信息
+        self.posted = 0
+        self.superseded = 0     # 未被界面线程取走就被覆盖的帧
+        self.wakeups = 0        # 实际投递到界面线程的事件数
+
+    def post(self, frame):
+        """放入一帧，返回 (是否需要唤醒界面线程, 本次覆盖的帧数)"""
+        with self._lock:
+            dropped = []
+            while len(self._frames) >= self.depth:
+                dropped.append(self._frames.pop(0))
+            self._frames.append(frame)
+            self.posted += 1
+            self.superseded += len(dropped)
+            wake = not self._wake_pending
+            if wake:
+                self._wake_pending = True
+                self.wakeups += 1
+        for old in dropped:
+            old.release()
+        return wake, len(dropped)
+
+    def take(self):
+        """取出最早的一帧，信箱为空时返回None；之后的新帧会再次唤醒界面线程"""
+        with self._lock:
+            self._wake_pending = False
+            return self._frames.pop(0) if self._frames else None
+
+    def clear(self):
+        """丢弃未取走的帧并归还缓冲区"""
+        with self._lock:
+            frames, self._frames = self._frames, []
+            self._wake_pending = False
+        for frame in frames:
+            frame.release()
+
+    def get_stats(self):
+        """获取信箱统计"""
+        with self._lock:
+            return {
+                'mailbox_depth': self.depth,
+                'mailbox_fill': len(self._frames),
+                'mailbox_posted': self.posted,
+                'mailbox_superseded': self.superseded,
+                'mailbox_wakeups': self.wakeups,
+            }
+
+
+__all__ = ['FrameRingBuffer', 'FramePool', 'PooledFrame', 'FrameMailbox']
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+视频帧源
+播放线程的解码阶段只通过帧源读取帧，由帧源负责打开、跳转与循环
+- CaptureSource: 基于cv2.VideoCapture，支持无缝循环（预先打开第二个capture停在开头）
+- ClipSource: 短视频第一遍解码时录入帧缓存，之后从缓存回放
+- PrerenderedSource: 从预渲染的原始帧文件按帧切片读取，不经过解码器
+- ProcessSource: 在独立进程中解码，经共享内存环形缓冲区传回帧，不与界面线程争用GIL
+"""
+
+import os
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+import cv2
+from threading import Thread
+
+from decoder_backends import open_capture, set_hardware_acceleration, get_hardware_acceleration, fourcc_to_codec
+from clip_cache import clip_cache
+from prerender import prerender_store, read_header
+from seek_index import seek_indexes
+from media_probe import media_probe
+
+
+class CaptureSource:
+    """cv2.VideoCapture帧源"""
+
+    def __init__(self, video_path, loop_mode="gapless"):
+        self.video_path = video_path
+        # 循环方式: "gapless" 备用capture停在开头，到结尾时直接切换；"seek" 到结尾时跳回第0帧
+        self.loop_mode = loop_mode
+        self.cap = None
+        self.standby = None
+        self.backend = ""
+        self.fps = 30
+        self.total_frames = 0
+        self.next_index = 0
+
+        self._standby_frame = None  # 备用capture已解码好的第0帧
+        self._standby_thread = None
+
+        # 循环切换统计：从读到结尾到下一轮第0帧就绪的耗时
+        self.loop_count = 0
+        self.last_loop_latency = 0.0
+        self.max_loop_latency = 0.0
+        self._total_loop_latency = 0.0
+
+        # 跳转统计
+        self.seek_count = 0
+        self.indexed_seeks = 0
+        self.last_seek_latency = 0.0
+        self.max_seek_latency = 0.0
+
+    def open(self):
+        """打开视频，成功返回True"""
+        self.cap, self.backend = open_capture(self.video_path)
+        if not self.cap.isOpened():
+            return False
+        info = media_probe.get(self.video_path)
+        if info and info.get('cv_frame_count') and info.get('cv_fps'):
+            self.total_frames = info['cv_frame_count']
+            self.fps = info['cv_fps']
+        else:
+            # 首次打开时记录OpenCV读到的元数据，之后所有播放器直接使用缓存
+            self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            media_probe.update(
+                self.video_path, cv_frame_count=self.total_frames, cv_fps=self.fps,
+                duration=self.total_frames / self.fps if not (info and info.get('duration')) else None,
+                width=width or None, height=height or None,
+                fourcc=fourcc_to_codec(self.cap.get(cv2.CAP_PROP_FOURCC)))
+        # 首次打开时在后台构建关键帧索引
+        seek_indexes.get(self.video_path, self.fps)
+
+        if self.loop_mode == "gapless":
+            standby, _ = open_capture(self.video_path)
+            if standby.isOpened():
+                self.standby = standby
+                self._start_standby_prepare()
+            else:
+                standby.release()
+                self.loop_mode = "seek"
+                print(f"无法打开备用capture，{os.path.basename(self.video_path)} 改用跳转循环")
+        return True
+
+    def read(self, out=None):
+        """读取下一帧，返回 (帧号, 帧)；到结尾时自动从头循环，失败返回 (-1, None)"""
+        ret, frame = self._read(self.cap, out)
+        if ret:
+            index = self.next_index
+            self.next_index += 1
+            return index, frame
+
+        start = time.perf_counter()
+        frame = self._wrap(out)
+        if frame is None:
+            return -1, None
+        self._record_loop(time.perf_counter() - start)
+        self.next_index = 1
+        return 0, frame
+
+    def seek(self, frame_number):
+        """跳转到指定帧：有关键帧索引时定位到之前最近的关键帧再逐帧前进，否则交给OpenCV定位"""
+        start = time.perf_counter()
+        index = seek_indexes.get(self.video_path, self.fps)
+        if index is not None:
+            keyframe = index.keyframe_before(frame_number)
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if position > frame_number or position < keyframe:
+                position = keyframe
+            # grab()只解码不转换颜色，快速前进到目标帧
+            while position < frame_number and self.cap.grab():
+                position += 1
+            self.indexed_seeks += 1
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        self.next_index = frame_number
+
+        latency = time.perf_counter() - start
+        self.seek_count += 1
+        self.last_seek_latency = latency
+        self.max_seek_latency = max(self.max_seek_latency, latency)
+
+    def release(self):
+        """释放所有capture"""
+        if self._standby_thread:
+            self._standby_thread.join()
+            self._standby_thread = None
+        for cap in (self.cap, self.standby):
+            if cap is not None:
+                cap.release()
+        self.cap = None
+        self.standby = None
+
+    def _read(self, cap, out):
+        """从capture读一帧，尽量直接解码到out中"""
+        if out is None:
+            return cap.read()
+        ret, frame = cap.read(out)
+        if ret and frame is not out and frame.shape == out.shape:
+            np.copyto(out, frame)
+            frame = out
+        return ret, frame
+
+    def _wrap(self, out):
+        """到达结尾时取下一轮的第0帧"""
+        if self.loop_mode == "gapless" and self.standby is not None:
+            if self._standby_thread:
+                self._standby_thread.join()
+                self._standby_thread = None
+            if self._standby_frame is not None:
+                frame = self._standby_frame
+                if out is not None and out.shape == frame.shape:
+                    np.copyto(out, frame)
+                    frame = out
+                else:
+                    frame = frame.copy()
+                # 备用capture已停在第1帧，直接接替；旧capture在后台回到开头成为新的备用
+                self.cap, self.standby = self.standby, self.cap
+                self._start_standby_prepare()
+                return frame
+
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        ret, frame = self._read(self.cap, out)
+        return frame if ret else None
+
+    def _start_standby_prepare(self):
+        self._standby_thread = Thread(target=self._prepare_standby, daemon=True)
+        self._standby_thread.start()
+
+    def _prepare_standby(self):
+        """后台把备用capture定位到开头并预解码第0帧"""
+        try:
+            self.standby.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._read(self.standby, self._standby_frame)
+            self._standby_frame = frame if ret else None
+        except Exception as e:
+            print(f"备用capture准备失败: {e}")
+            self._standby_frame = None
+
+    def _record_loop(self, latency):
+        self.loop_count += 1
+        self.last_loop_latency = latency
+        self.max_loop_latency = max(self.max_loop_latency, latency)
+        self._total_loop_latency += latency
+
+    def get_stats(self):
+        """获取帧源统计（耗时单位：毫秒）"""
+        return {
+            'decoder_backend': self.backend,
+            'loop_mode': self.loop_mode,
+            'loop_count': self.loop_count,
+            'last_loop_latency_ms': round(self.last_loop_latency * 1000, 2),
+            'max_loop_latency_ms': round(self.max_loop_latency * 1000, 2),
+            'avg_loop_latency_ms': round(self._total_loop_latency / self.loop_count * 1000, 2) if self.loop_count else 0.0,
+            'seek_count': self.seek_count,
+            'indexed_seeks': self.indexed_seeks,
+            'last_seek_latency_ms': round(self.last_seek_latency * 1000, 2),
+            'max_seek_latency_ms': round(self.max_seek_latency * 1000, 2),
+        }
+
+
+class ClipSource:
+    """短视频帧源：命中缓存时直接回放，否则边解码边录入，完整一遍后切换为回放"""
+
+    def __init__(self, video_path, loop_mode="gapless", display_size=None, cache=clip_cache):
+        self.video_path = video_path
+        self.loop_mode = loop_mode
+        self.display_size = display_size  # 录入分辨率上限（宽, 高），None为原始分辨率
+        self.cache = cache
+        self.capture = None   # 录入或不缓存时使用的CaptureSource
+        self.clip = None      # 回放或录入中的帧存储
+        self.recording = False
+        self.recorded = 0
+        self.backend = ""
+        self.fps = 30
+        self.total_frames = 0
+        self.next_index = 0
+        self.loop_count = 0
+        self._scratch = None
+        self._frame_size = None   # 录入帧的（宽, 高），与原始分辨率不同时需要缩放；放弃录入后仍保持，保证帧尺寸不变
+        self._source_size = None      # 视频原始（宽, 高）
+        self._display_grown = False   # 打开后出现了更大的显示分辨率
+
+    def open(self):
+        """打开视频，成功返回True"""
+        key = self.cache.make_key(self.video_path, self.display_size)
+        self.clip = self.cache.lookup(key)
+        if self.clip is not None:
+            self.total_frames = self.clip.frame_count
+            self.fps = self.clip.fps
+            self.backend = "clip cache"
+            return True
+
+        self.capture = CaptureSource(self.video_path, self.loop_mode)
+        if not self.capture.open():
+            return False
+        self.total_frames = self.capture.total_frames
+        self.fps = self.capture.fps
+        self.backend = self.capture.backend
+
+        cap = self.capture.cap
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._source_size = (width, height)
+        if self.total_frames / self.fps <= self.cache.max_duration and width and height:
+            self._frame_size = self._fit_display(width, height)
+            self.clip = self.cache.begin_record(
+                key, self.total_frames, (self._frame_size[1], self._frame_size[0], 3), self.fps)
+            self.recording = self.clip is not None
+            if self._frame_size == (width, height):
+                self._frame_size = None
+        if not self.recording:
+            self._frame_size = None
+        return True
+
+    def set_display_size(self, display_size):
+        """订阅者的最大显示分辨率变大（界面线程调用）：录入分辨率不足时由解码线程在下次读帧时放弃录入，
+        避免按较小分辨率写入缓存；之后重新打开该文件时按新分辨率录入"""
+        self.display_size = display_size
+        self._display_grown = True
+
+    def _fit_display(self, width, height):
+        """按显示分辨率等比缩小，不放大"""
+        if not self.display_size:
+            return width, height
+        scale = min(self.display_size[0] / width, self.display_size[1] / height, 1.0)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def read(self, out=None):
+        """读取下一帧，返回 (帧号, 帧)；到结尾时自动从头循环，失败返回 (-1, None)"""
+        if self.capture is None:
+            return self._replay(out)
+
+        if self._frame_size is None:
+            index, frame = self.capture.read(out)
+        else:
+            index, raw = self.capture.read(self._scratch)
+            self._scratch = raw
+            frame = None
+            if raw is not None:
+                frame = cv2.resize(raw, self._frame_size, dst=out, interpolation=cv2.INTER_AREA)
+        if frame is None:
+            self._stop_recording()
+            return -1, None
+
+        if self.recording and self._display_grown:
+            self._display_grown = False
+            recorded_size = (self.clip.frames.shape[2], self.clip.frames.shape[1])
+            if self._fit_display(*self._source_size) != recorded_size:
+                self._stop_recording()
+        if self.recording:
+            if index == 0 and self.recorded > 0:
+                # 完整录入一遍，之后从缓存回放，释放解码器
+                self.cache.commit(self.clip, self.recorded)
+                self.recording = False
+                self.total_frames = self.clip.frame_count
+                self.capture.release()
+                self.capture = None
+                self.backend = "clip cache"
+                self.loop_count += 1
+                self.next_index = 1
+                return 0, frame
+            if index == self.recorded and index < self.clip.frame_count:
+                self.clip.frames[index] = frame
+                self.recorded += 1
+            else:
+                # 帧数与预估不符，放弃录入
+                self._stop_recording()
+        return index, frame
+
+    def _replay(self, out):
+        index = self.next_index
+        frame = self.clip.frames[index]
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            frame = out
+        else:
+            frame = np.array(frame)
+        self.next_index = index + 1
+        if self.next_index >= self.clip.frame_count:
+            self.next_index = 0
+            self.loop_count += 1
+        return index, frame
+
+    def seek(self, frame_number):
+        """跳转到指定帧"""
+        if self.capture is None:
+            self.next_index = min(max(0, frame_number), self.clip.frame_count - 1)
+            return
+        # 跳转打断了连续录入
+        self._stop_recording()
+        self.capture.seek(frame_number)
+
+    def _stop_recording(self):
+        if self.recording:
+            self.cache.abort(self.clip)
+            self.recording = False
+            self.clip = None
+
+    def release(self):
+        """释放解码器与帧存储引用，未完成的录入作废"""
+        self._stop_recording()
+        if self.clip is not None:
+            self.cache.release(self.clip)
+            self.clip = None
+        if self.capture:
+            self.capture.release()
+            self.capture = None
+
+    def get_stats(self):
+        """获取帧源统计"""
+        if self.capture is not None:
+            stats = self.capture.get_stats()
+        else:
+            stats = {'decoder_backend': self.backend, 'loop_mode': self.loop_mode, 'loop_count': self.loop_count}
+        stats['clip_state'] = "replay" if self.capture is None else ("recording" if self.recording else "bypass")
+        return stats
+
+
+class PrerenderedSource:
+    """预渲染原始帧文件帧源，按帧号直接切片，跳转精确且无解码开销"""
+
+    def __init__(self, path):
+        self.path = path
+        self.frames = None
+        self.backend = "prerendered"
+        self.loop_mode = "prerendered"
+        self.fps = 30
+        self.total_frames = 0
+        self.next_index = 0
+        self.loop_count = 0
+
+    def open(self):
+        """映射预渲染文件，成功返回True"""
+        info = read_header(self.path)
+        if info is None or info['frame_count'] <= 0:
+            return False
+        try:
+            self.frames = np.memmap(self.path, dtype=np.uint8, mode='r', offset=info['data_offset'],
+                                    shape=(info['frame_count'], info['height'], info['width'], 3))
+        except Exception as e:
+            print(f"映射预渲染文件失败: {e}")
+            return False
+        self.fps = info['fps']
+        self.total_frames = info['frame_count']
+        return True
+
+    def read(self, out=None):
+        """读取下一帧，返回 (帧号, 帧)；到结尾时自动从头循环"""
+        index = self.next_index
+        frame = self.frames[index]
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            frame = out
+        else:
+            frame = np.array(frame)
+        self.next_index = index + 1
+        if self.next_index >= self.total_frames:
+            self.next_index = 0
+            self.loop_count += 1
+        return index, frame
+
+    def seek(self, frame_number):
+        """跳转到指定帧"""
+        self.next_index = min(max(0, frame_number), self.total_frames - 1)
+
+    def release(self):
+        """解除文件映射"""
+        self.frames = None
+
+    def get_stats(self):
+        """获取帧源统计"""
+        return {'decoder_backend': self.backend, 'loop_mode': self.loop_mode, 'loop_count': self.loop_count}
+
+
+def _process_decode_worker(video_path, loop_mode, hardware_acceleration, conn, meta, free, filled, stop_event, depth):
+    """解码子进程：用CaptureSource解码，写入父进程创建的共享内存环形缓冲区"""
+    set_hardware_acceleration(hardware_acceleration)
+    source = CaptureSource(video_path, loop_mode)
+    shm = None
+    slots = None
+    try:
+        if not source.open():
+            conn.send(('error', "无法打开视频文件"))
+            return
+        index, frame = source.read()
+        if frame is None:
+            conn.send(('error', "无法读取视频帧"))
+            return
+        conn.send(('info', frame.shape, source.fps, source.total_frames, source.backend))
+
+        # 等待父进程按帧尺寸创建共享内存
+        message = conn.recv()
+        if message[0] != 'shm':
+            return
+        # 子进程与父进程共用同一个resource_tracker，登记由父进程负责；子进程只close()，不unlink()
+        shm = shared_memory.SharedMemory(name=message[1])
+        slots = np.ndarray((depth,) + frame.shape, dtype=np.uint8, buffer=shm.buf)
+
+        generation = 0
+        write_pos = 0
+        pending = (index, frame)
+        last_stats = time.perf_counter()
+        while not stop_event.is_set():
+            while conn.poll():
+                message = conn.recv()
+                if message[0] == 'seek':
+                    source.seek(message[1])
+                    generation = message[2]
+                    pending = None
+                elif message[0] == 'stop':
+                    return
+
+            if not free.acquire(timeout=0.1):
+                continue
+            slot = slots[write_pos]
+            if pending is not None:
+                index, frame = pending
+                np.copyto(slot, frame)
+                pending = None
+            else:
+                index, frame = source.read(slot)
+                if frame is None:
+                    free.release()
+                    conn.send(('error', "读取视频帧失败"))
+                    return
+                if frame is not slot:
+                    if frame.shape != slot.shape or frame.dtype != slot.dtype:
+                        # 分辨率或像素格式中途变化，共享内存槽位无法容纳
+                        free.release()
+                        conn.send(('error', f"视频帧尺寸变化: {frame.shape}，共享缓冲区为 {slot.shape}"))
+                        return
+                    # 帧源未直接写入槽位（如解码器返回了新数组），复制进去
+                    np.copyto(slot, frame)
+            meta[write_pos * 2] = index
+            meta[write_pos * 2 + 1] = generation
+            write_pos = (write_pos + 1) % depth
+            filled.release()
+
+            now = time.perf_counter()
+            if now - last_stats >= 1.0:
+                conn.send(('stats', source.get_stats()))
+                last_stats = now
+    except (EOFError, BrokenPipeError):
+        pass
+    except Exception as e:
+        print(f"解码进程错误: {e}")
+        try:
+            conn.send(('error', str(e)))
+        except Exception:
+            pass
+    finally:
+        source.release()
+        # 解码进程不执行atexit，退出前写入本进程得到的元数据
+        media_probe.flush()
+        if shm is not None:
+            del slots
+            shm.close()
+
+
+class ProcessSource:
+    """多进程帧源：解码在子进程中进行，帧经共享内存环形缓冲区传回"""
+
+    def __init__(self, video_path, loop_mode="gapless", depth=4):
+        self.video_path = video_path
+        self.loop_mode = loop_mode
+        self.depth = max(2, int(depth))
+        self.backend = ""
+        self.fps = 30
+        self.total_frames = 0
+        self.generation = 0
+        self.process = None
+        self.error = None
+        self.shm = None
+        self.slots = None
+        self._conn = None
+        self._read_pos = 0
+        self._child_stats = {}
+
+    def open(self):
+        """启动解码进程并建立共享内存，成功返回True"""
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._meta = context.Array('q', self.depth * 2, lock=False)
+        self._free = context.Semaphore(self.depth)
+        self._filled = context.Semaphore(0)
+        self._stop = context.Event()
+        self.process = context.Process(
+            target=_process_decode_worker,
+            args=(self.video_path, self.loop_mode, get_hardware_acceleration(), child_conn,
+                  self._meta, self._free, self._filled, self._stop, self.depth),
+            daemon=True)
+        self.process.start()
+
+        if not self._conn.poll(15):
+            print(f"解码进程启动超时: {os.path.basename(self.video_path)}")
+            return False
+        message = self._conn.recv()
+        if message[0] != 'info':
+            print(f"解码进程打开视频失败: {message[1]}")
+            return False
+        _, shape, self.fps, self.total_frames, backend = message
+        self.backend = f"{backend}, 进程 {self.process.pid}"
+
+        self.shm = shared_memory.SharedMemory(create=True, size=self.depth * int(np.prod(shape)))
+        self.slots = np.ndarray((self.depth,) + tuple(shape), dtype=np.uint8, buffer=self.shm.buf)
+        self._conn.send(('shm', self.shm.name))
+        return True
+
+    def _poll_messages(self):
+        """接收子进程的统计与错误消息"""
+        try:
+            while self._conn.poll():
+                message = self._conn.recv()
+                if message[0] == 'stats':
+                    self._child_stats = message[1]
+                elif message[0] == 'error':
+                    self.error = message[1]
+                    print(f"解码进程错误: {self.error}")
+        except (EOFError, OSError):
+            if self.error is None:
+                self.error = "解码进程已退出"
+
+    def read(self, out=None, timeout=5.0):
+        """从共享内存取下一帧，返回 (帧号, 帧)；子进程出错或无响应时返回 (-1, None)"""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            self._poll_messages()
+            if self.error is not None:
+                return -1, None
+            if not self._filled.acquire(timeout=0.1):
+                if not self.process.is_alive():
+                    return -1, None
+                continue
+            pos = self._read_pos
+            self._read_pos = (pos + 1) % self.depth
+            index, generation = self._meta[pos * 2], self._meta[pos * 2 + 1]
+            if generation != self.generation:
+                # 跳转前解码的旧帧
+                self._free.release()
+                continue
+            frame = self.slots[pos]
+            if out is not None and out.shape == frame.shape:
+                np.copyto(out, frame)
+                frame = out
+            else:
+                frame = np.array(frame)
+            self._free.release()
+            return index, frame
+        print(f"解码进程无响应: {os.path.basename(self.video_path)}")
+        return -1, None
+
+    def seek(self, frame_number):
+        """通知子进程跳转，之前缓冲的帧作废"""
+        self.generation += 1
+        try:
+            self._conn.send(('seek', frame_number, self.generation))
+        except (BrokenPipeError, OSError):
+            pass
+
+    def release(self):
+        """停止子进程并回收共享内存"""
+        if self.process is not None:
+            self._stop.set()
+            try:
+                self._conn.send(('stop',))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(2)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(1)
+            self.process = None
+        if self.shm is not None:
+            self.slots = None
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
+
+    def get_stats(self):
+        """获取帧源统计（解码统计由子进程定期上报）"""
+        stats = dict(self._child_stats)
+        stats['decoder_backend'] = self.backend
+        stats['process_ring_depth'] = self.depth
+        return stats
+
+
+# 多进程解码开关，由主程序按设置配置
+_process_decode = False
+
+
+def set_process_decode(enabled):
+    """设置是否在独立进程中解码视频"""
+    global _process_decode
+    _process_decode = bool(enabled)
+
+
+def open_source(video_path, loop_mode="gapless", display_size=None):
+    """按设置选择帧源：优先使用预渲染文件，其次短视频缓存、独立进程解码，否则直接解码"""
+    if prerender_store.enabled:
+        path = prerender_store.lookup(video_path, display_size)
+        if path:
+            source = PrerenderedSource(path)
+            if source.open():
+                return source
+            print(f"预渲染文件无效，改为直接解码: {os.path.basename(video_path)}")
+        else:
+            # 本次直接解码，后台生成预渲染文件供下次播放使用
+            prerender_store.request(video_path, display_size)
+    if clip_cache.enabled:
+        return ClipSource(video_path, loop_mode, display_size)
+    if _process_decode:
+        return ProcessSource(video_path, loop_mode)
+    return CaptureSource(video_path, loop_mode)
+
+
+__all__ = ['CaptureSource', 'ClipSource', 'PrerenderedSource', 'ProcessSource', 'open_source', 'set_process_decode']
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+基于QOpenGLWidget的视频渲染表面
+帧以纹理上传，着色器中完成等比适配，交换与垂直同步对齐
+仅使用OpenGL 2.0 / GLSL 1.10 特性，可在Mesa llvmpipe等软件渲染器下运行
+"""
+
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtGui import (QOpenGLContext, QOffscreenSurface, QOpenGLShader, QOpenGLShaderProgram,
+                         QOpenGLTexture, QOpenGLPixelTransferOptions, QOpenGLVersionProfile,
+                         QSurfaceFormat, QVector2D)
+from PyQt5.QtWidgets import QOpenGLWidget, QSizePolicy
+
+GL_COLOR_BUFFER_BIT = 0x00004000
+GL_TRIANGLE_STRIP = 0x0005
+
+VERTEX_SHADER = """
+attribute vec2 a_position;
+attribute vec2 a_texcoord;
+uniform vec2 u_frame_size;
+uniform vec2 u_view_size;
+varying vec2 v_texcoord;
+
+void main()
+{
+    // 等比适配：按较小的缩放比铺满视口，其余部分留黑边
+    vec2 ratio = u_view_size / u_frame_size;
+    float fit = min(ratio.x, ratio.y);
+    vec2 scale = u_frame_size * fit / u_view_size;
+    gl_Position = vec4(a_position * scale, 0.0, 1.0);
+    v_texcoord = a_texcoord;
+}
+"""
+
+FRAGMENT_SHADER = """
+#ifdef GL_ES
+precision mediump float;
+#endif
+uniform sampler2D u_texture;
+varying vec2 v_texcoord;
+
+void main()
+{
+    gl_FragColor = texture2D(u_texture, v_texcoord);
+}
+"""
+
+_gl_available = None
+
+
+def gl_available():
+    """检测能否创建OpenGL上下文（结果缓存）"""
+    global _gl_available
+    if _gl_available is None:
+        try:
+            context = QOpenGLContext()
+            surface = QOffscreenSurface()
+            surface.create()
+            _gl_available = context.create() and context.makeCurrent(surface)
+            if _gl_available:
+                print(f"OpenGL可用: {context.format().majorVersion()}.{context.format().minorVersion()}")
+                context.doneCurrent()
+        except Exception as e:
+            print(f"OpenGL检测失败: {e}")
+            _gl_available = False
+    return _gl_available
+
+
+class GLVideoSurface(QOpenGLWidget):
+    """OpenGL视频表面，接口与VideoFrameLabel一致（present / clear_frame）"""
+
+    initFailed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        # 交换间隔为1：每次交换等待垂直同步
+        surface_format = QSurfaceFormat.defaultFormat()
+        surface_format.setSwapInterval(1)
+        self.setFormat(surface_format)
+
+        self.gl = None
+        self.program = None
+        self.texture = None
+        self.texture_size = None
+        self.texture_smooth = None
+        self.failed = False
+
+        self.pending_frame = None
+        self.has_image = False
+
+        # 统计信息
+        self.frames_uploaded = 0
+        self.frames_superseded = 0  # 两次重绘之间被新帧替换、未上传的帧
+
+        self.frameSwapped.connect(self._on_frame_swapped)
+
+    def present(self, frame):
+        """提交新帧，下一次重绘时上传；未上传的旧帧直接归还"""
+        if self.failed:
+            frame.release()
+            return
+        if self.pending_frame is not None:
+            self.pending_frame.release()
+            self.frames_superseded += 1
+        self.pending_frame = frame
+        self.update()
+
+    def clear_frame(self):
+        """清除画面"""
+        if self.pending_frame is not None:
+            self.pending_frame.release()
+            self.pending_frame = None
+        self.has_image = False
+        self.update()
+
+    def initializeGL(self):
+        """初始化着色器与GL函数，失败时通知播放器回退到标签渲染"""
+        try:
+            profile = QOpenGLVersionProfile()
+            profile.setVersion(2, 0)
+            self.gl = self.context().versionFunctions(profile)
+            if self.gl is None:
+                raise RuntimeError("无法获取OpenGL 2.0函数")
+            self.gl.initializeOpenGLFunctions()
+
+            self.program = QOpenGLShaderProgram(self)
+            if not self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, VERTEX_SHADER):
+                raise RuntimeError(self.program.log())
+            if not self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, FRAGMENT_SHADER):
+                raise RuntimeError(self.program.log())
+            if not self.program.link():
+                raise RuntimeError(self.program.log())
+
+            self.context().aboutToBeDestroyed.connect(self._cleanup_gl)
+            print(f"OpenGL视频表面就绪: {self.gl.glGetString(0x1F01)}")  # GL_RENDERER
+        except Exception as e:
+            self._fail(f"OpenGL初始化失败: {e}")
+
+    def paintGL(self):
+        """上传待显示帧并绘制全屏四边形"""
+        if self.failed:
+            return
+        try:
+            self.gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+            self.gl.glClear(GL_COLOR_BUFFER_BIT)
+
+            frame = self.pending_frame
+            if frame is not None:
+                self.pending_frame = None
+                try:
+                    self._upload(frame)
+                finally:
+                    frame.release()
+
+            if self.has_image:
+                self._draw()
+        except Exception as e:
+            self._fail(f"OpenGL绘制失败: {e}")
+
+    def _upload(self, frame):
+        """把池化帧上传到纹理，尺寸不变时复用纹理存储"""
+        if self.texture is None or self.texture_size != (frame.width, frame.height):
+            if self.texture is not None:
+                self.texture.destroy()
+            self.texture = QOpenGLTexture(QOpenGLTexture.Target2D)
+            self.texture.setFormat(QOpenGLTexture.RGB8_UNorm)
+            self.texture.setSize(frame.width, frame.height)
+            self.texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+            self.texture.allocateStorage(QOpenGLTexture.RGB, QOpenGLTexture.UInt8)
+            self.texture_size = (frame.width, frame.height)
+            self.texture_smooth = None
+
+        # 负载过高时改用最近邻采样
+        if self.texture_smooth != frame.smooth:
+            texture_filter = QOpenGLTexture.Linear if frame.smooth else QOpenGLTexture.Nearest
+            self.texture.setMinMagFilters(texture_filter, texture_filter)
+            self.texture_smooth = frame.smooth
+
+        # RGB888行宽不一定是4字节对齐
+        options = QOpenGLPixelTransferOptions()
+        options.setAlignment(1)
+        options.setRowLength(frame.array.strides[0] // 3)
+        self.texture.setData(QOpenGLTexture.RGB, QOpenGLTexture.UInt8, frame.array, options)
+        self.has_image = True
+        self.frames_uploaded += 1
+
+    def _draw(self):
+        """绘制纹理四边形，等比缩放在顶点着色器中完成"""
+        program = self.program
+        program.bind()
+        self.texture.bind(0)
+        program.setUniformValue("u_texture", 0)
+        program.setUniformValue("u_frame_size", QVector2D(*self.texture_size))
+        program.setUniformValue("u_view_size", QVector2D(max(1, self.width()), max(1, self.height())))
+
+        position = program.attributeLocation("a_position")
+        texcoord = program.attributeLocation("a_texcoord")
+        program.enableAttributeArray(position)
+        program.enableAttributeArray(texcoord)
+        # 纹理第0行是图像顶部，对应NDC的y=1
+        program.setAttributeArray(position, [QVector2D(-1, -1), QVector2D(1, -1), QVector2D(-1, 1), QVector2D(1, 1)])
+        program.setAttributeArray(texcoord, [QVector2D(0, 1), QVector2D(1, 1), QVector2D(0, 0), QVector2D(1, 0)])
+        self.gl.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        program.disableAttributeArray(position)
+        program.disableAttributeArray(texcoord)
+
+        self.texture.release()
+        program.release()
+
+    def _on_frame_swapped(self):
+        """交换完成后若已有新帧等待，立即安排下一次重绘"""
+        if self.pending_frame is not None:
+            self.update()
+
+    def _fail(self, reason):
+        """标记失败并异步通知（避免在GL回调中销毁自身）"""
+        if self.failed:
+            return
+        self.failed = True
+        print(reason)
+        if self.pending_frame is not None:
+            self.pending_frame.release()
+            self.pending_frame = None
+        QTimer.singleShot(0, lambda: self.initFailed.emit(reason))
+
+    def _cleanup_gl(self):
+        """上下文销毁前释放GL资源"""
+        self.makeCurrent()
+        if self.texture is not None:
+            self.texture.destroy()
+            self.texture = None
+        self.program = None
+        self.doneCurrent()
+
+    def get_stats(self):
+        """获取渲染统计"""
+        return {
+            'render_backend': 'opengl',
+            'frames_uploaded': self.frames_uploaded,
+            'frames_superseded': self.frames_superseded,
+        }
+
+
+__all__ = ['GLVideoSurface', 'gl_available']
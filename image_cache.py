@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+解码图片缓存
+所有内容窗口共用的已解码图片缓存，按 路径 + 修改时间 + 目标尺寸 + 缩放方式 索引，
+切换到共用同一素材的配置时不再读盘与缩放；全局字节预算，按LRU淘汰
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+class ImageCache:
+    """进程内共享的解码图片缓存（存放QImage）"""
+
+    def __init__(self, budget_bytes=128 * 1024 * 1024):
+        self.enabled = True
+        self.budget_bytes = budget_bytes
+
+        self._lock = threading.Lock()
+        self._images = OrderedDict()   # key -> (QImage, 字节数)，按最近使用排序
+        self.used_bytes = 0
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, enabled, budget_mb=None):
+        """应用设置；关闭或缩小预算时立即淘汰超出部分"""
+        with self._lock:
+            self.enabled = bool(enabled)
+            if budget_mb is not None:
+                self.budget_bytes = int(budget_mb * 1024 * 1024)
+            self._evict(0 if not self.enabled else self.budget_bytes)
+
+    def make_key(self, image_path, target_size, transform):
+        """缓存键：路径 + 修改时间 + 目标尺寸 + 缩放方式；文件不存在时返回None"""
+        try:
+            mtime = os.path.getmtime(image_path)
+        except OSError:
+            return None
+        size = (target_size.width(), target_size.height()) if target_size is not None else None
+        return (os.path.normcase(os.path.abspath(image_path)), mtime, size, int(transform))
+
+    def lookup(self, key):
+        """查找已解码图片，命中时移到LRU末尾"""
+        with self._lock:
+            entry = self._images.get(key) if self.enabled and key is not None else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def insert(self, key, image):
+        """加入缓存；单张超过预算时不缓存"""
+        nbytes = image.sizeInBytes()
+        with self._lock:
+            if not self.enabled or key is None or nbytes > self.budget_bytes:
+                return
+            old = self._images.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[1]
+            self._evict(self.budget_bytes - nbytes)
+            self._images[key] = (image, nbytes)
+            self.used_bytes += nbytes
+
+    def _evict(self, target_bytes):
+        """按LRU淘汰直到占用不超过target_bytes；调用方持有锁"""
+        while self._images and self.used_bytes > target_bytes:
+            _, (_, nbytes) = self._images.popitem(last=False)
+            self.used_bytes -= nbytes
+            self.evictions += 1
+
+    def get_stats(self):
+        """获取缓存统计"""
+        with self._lock:
+            return {
+                'image_cache_enabled': self.enabled,
+                'image_entries': len(self._images),
+                'image_bytes': self.used_bytes,
+                'image_budget_bytes': self.budget_bytes,
+                'image_hits': self.hits,
+                'image_misses': self.misses,
+                'image_evictions': self.evictions,
+            }
+
+
+# 进程内唯一的图片缓存，由主程序按设置调整预算
+image_cache = ImageCache()
+
+
+__all__ = ['ImageCache', 'image_cache']
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+后台图片解码
+在线程池中用QImageReader按显示尺寸解码（setScaledSize），超大图片只展开显示分辨率的像素，
+结果以QImage交回界面线程，绘制时才由QPainter转换，界面线程不再做整图解码与平滑缩放；
+解码结果写入共享图片缓存（image_cache），相同素材再次显示时直接命中
+"""
+
+import os
+import time
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QRect, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPainter
+from PyQt5.QtWidgets import QLabel
+
+from image_cache import image_cache
+
+
+def decode_image(path, target_size=None, transform=Qt.SmoothTransformation):
+    """按目标尺寸等比解码图片（只缩小不放大），返回 (QImage, 错误信息)"""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if target_size is not None and source_size.isValid():
+        scaled = source_size.scaled(target_size, Qt.KeepAspectRatio)
+        if scaled.width() < source_size.width():
+            # JPEG等格式在解码阶段直接按比例缩小，不展开原始分辨率
+            reader.setScaledSize(scaled)
+    image = reader.read()
+    if image.isNull():
+        return None, reader.errorString() or "图片格式不支持"
+    if target_size is not None and (image.width() > target_size.width() or image.height() > target_size.height()):
+        # 不支持按尺寸解码的格式（或自动旋转后方向变化）再缩放一次
+        image = image.scaled(target_size, Qt.KeepAspectRatio, transform)
+    return image, None
+
+
+class _DecodeTask(QRunnable):
+    """线程池任务：解码一张图片"""
+
+    def __init__(self, loader, ticket, path, target_size, transform, cache_key):
+        super().__init__()
+        self.loader = loader
+        self.ticket = ticket
+        self.path = path
+        self.target_size = target_size
+        self.transform = transform
+        self.cache_key = cache_key
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            image, error = decode_image(self.path, self.target_size, self.transform)
+        except Exception as e:
+            image, error = None, str(e)
+        if image is not None:
+            image_cache.insert(self.cache_key, image)
+        self.loader._finish(self.ticket, self.path, image, error, time.perf_counter() - start)
+
+
+class ImageLoader(QObject):
+    """进程内共享的后台图片解码器，按请求号返回结果"""
+
+    imageReady = pyqtSignal(int, QImage)   # (请求号, 解码结果)
+    imageFailed = pyqtSignal(int, str)     # (请求号, 错误信息)
+
+    def __init__(self, workers=2):
+        super().__init__()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(workers)
+        self._lock = threading.Lock()
+        self._next_ticket = 0
+
+        # 统计信息
+        self.decoded = 0
+        self.failed = 0
+        self.decode_time = 0.0
+
+    def _normalize(self, target_size):
+        if target_size is None:
+            return None
+        return QSize(max(1, target_size.width()), max(1, target_size.height()))
+
+    def cached(self, path, target_size=None, transform=Qt.SmoothTransformation):
+        """查找已解码的图片，命中时返回QImage，可直接显示而无需排队解码"""
+        target_size = self._normalize(target_size)
+        return image_cache.lookup(image_cache.make_key(path, target_size, transform))
+
+    def load(self, path, target_size=None, transform=Qt.SmoothTransformation):
+        """提交解码请求，立即返回请求号；结果通过imageReady/imageFailed信号送回界面线程"""
+        with self._lock:
+            self._next_ticket += 1
+            ticket = self._next_ticket
+        target_size = self._normalize(target_size)
+        cache_key = image_cache.make_key(path, target_size, transform)
+        self.pool.start(_DecodeTask(self, ticket, path, target_size, transform, cache_key))
+        return ticket
+
+    def _finish(self, ticket, path, image, error, elapsed):
+        """工作线程完成（跨线程信号自动排队到界面线程）"""
+        with self._lock:
+            self.decode_time += elapsed
+            if image is None:
+                self.failed += 1
+            else:
+                self.decoded += 1
+        if image is None:
+            print(f"图片解码失败 {os.path.basename(path)}: {error}")
+            self.imageFailed.emit(ticket, error)
+        else:
+            self.imageReady.emit(ticket, image)
+
+    def get_stats(self):
+        """获取解码统计"""
+        with self._lock:
+            return {
+                'image_decoded': self.decoded,
+                'image_decode_failed': self.failed,
+                'image_decode_avg_ms': round(self.decode_time * 1000 / self.decoded, 1) if self.decoded else 0.0,
+            }
+
+
+class ImageView(QLabel):
+    """显示QImage的标签：保持原图数据，绘制时居中并按需等比缩小"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.image = None
+
+    def set_image(self, image):
+        self.image = image
+        self.update()
+
+    def clear_image(self):
+        self.image = None
+        self.update()
+
+    def paintEvent(self, event):
+        """无图片时按普通标签绘制文字"""
+        if self.image is None or self.image.isNull():
+            super().paintEvent(event)
+            return
+        size = self.image.size()
+        if size.width() > self.width() or size.height() > self.height():
+            size = size.scaled(self.size(), Qt.KeepAspectRatio)
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        x = (self.width() - size.width()) // 2
+        y = (self.height() - size.height()) // 2
+        painter.drawImage(QRect(x, y, size.width(), size.height()), self.image)
+        painter.end()
+
+
+_loader = None
+
+
+def image_loader():
+    """后台图片解码器单例（需在QApplication创建后使用）"""
+    global _loader
+    if _loader is None:
+        _loader = ImageLoader()
+    return _loader
+
+
+__all__ = ['ImageLoader', 'ImageView', 'decode_image', 'image_loader']
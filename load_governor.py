@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+播放负载调节
+界面端来不及消费帧时按级别逐步降级，负载恢复后逐级还原：
+  1 源头抽帧  - 每两帧只转换发送一帧
+  2 快速缩放  - 缩放改用最近邻，绘制关闭平滑变换
+  3 降低分辨率 - 按目标尺寸的一半输出，由显示端放大
+每次升降级都会记录日志并计数，便于评估硬件配置
+"""
+
+import time
+
+LEVEL_NORMAL = 0
+LEVEL_DROP = 1
+LEVEL_FAST_SCALING = 2
+LEVEL_REDUCED_RESOLUTION = 3
+
+LEVEL_NAMES = {
+    LEVEL_NORMAL: "正常",
+    LEVEL_DROP: "源头抽帧",
+    LEVEL_FAST_SCALING: "快速缩放",
+    LEVEL_REDUCED_RESOLUTION: "降低分辨率",
+}
+
+
+class LoadGovernor:
+    """按丢帧率调节单个输出的降级级别"""
+
+    def __init__(self, name="", window=1.0, escalate_ratio=0.05, recover_windows=5, max_level=LEVEL_REDUCED_RESOLUTION):
+        self.name = name
+        self.window = window                    # 统计窗口（秒）
+        self.escalate_ratio = escalate_ratio    # 窗口内丢帧率超过该值时升一级
+        self.recover_windows = recover_windows  # 连续多少个无丢帧窗口后降一级
+        self.max_level = max_level
+        self.level = LEVEL_NORMAL
+
+        self._window_start = time.perf_counter()
+        self._frames = 0
+        self._drops = 0
+        self._clean_windows = 0
+        self._frame_counter = 0
+
+        # 统计信息
+        self.escalations = 0
+        self.recoveries = 0
+        self.decimated_frames = 0
+        self.peak_level = LEVEL_NORMAL
+        self.level_entries = {level: 0 for level in LEVEL_NAMES}
+
+    @property
+    def fast_scaling(self):
+        return self.level >= LEVEL_FAST_SCALING
+
+    @property
+    def resolution_scale(self):
+        return 0.5 if self.level >= LEVEL_REDUCED_RESOLUTION else 1.0
+
+    def should_deliver(self):
+        """源头抽帧级别下隔帧跳过；返回False的帧不做转换"""
+        self._frame_counter += 1
+        if self.level >= LEVEL_DROP and self._frame_counter % 2:
+            self.decimated_frames += 1
+            return False
+        return True
+
+    def record(self, delivered):
+        """记录一次发送结果（False表示界面端积压导致丢帧），必要时调整级别"""
+        self._frames += 1
+        if not delivered:
+            self._drops += 1
+
+        now = time.perf_counter()
+        if now - self._window_start < self.window:
+            return
+        ratio = self._drops / self._frames if self._frames else 0.0
+        self._window_start = now
+        self._frames = 0
+        self._drops = 0
+
+        if ratio > self.escalate_ratio:
+            self._clean_windows = 0
+            if self.level < self.max_level:
+                self._set_level(self.level + 1, f"丢帧率 {ratio:.0%}")
+                self.escalations += 1
+        elif ratio == 0:
+            self._clean_windows += 1
+            if self.level > LEVEL_NORMAL and self._clean_windows >= self.recover_windows:
+                self._clean_windows = 0
+                self._set_level(self.level - 1, f"连续{self.recover_windows}秒无丢帧")
+                self.recoveries += 1
+        else:
+            self._clean_windows = 0
+
+    def _set_level(self, level, reason):
+        print(f"播放负载调节 {self.name}: {LEVEL_NAMES[self.level]} -> {LEVEL_NAMES[level]}（{reason}）")
+        self.level = level
+        self.level_entries[level] += 1
+        self.peak_level = max(self.peak_level, level)
+
+    def get_stats(self):
+        """获取负载调节统计"""
+        return {
+            'load_level': self.level,
+            'load_level_name': LEVEL_NAMES[self.level],
+            'load_peak_level': self.peak_level,
+            'load_escalations': self.escalations,
+            'load_recoveries': self.recoveries,
+            'load_decimated_frames': self.decimated_frames,
+            'load_level_entries': dict(self.level_entries),
+        }
+
+
+__all__ = ['LoadGovernor', 'LEVEL_NORMAL', 'LEVEL_DROP', 'LEVEL_FAST_SCALING',
+           'LEVEL_REDUCED_RESOLUTION', 'LEVEL_NAMES']
@@ -9,11 +9,19 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPixmap, QFont, QIcon
 from screen_manager import ScreenManager
-from threaded_content_window import ThreadedContentWindow
+from threaded_content_window import ThreadedContentWindow, OPENCV_AVAILABLE
+from renderer_process import RendererProxy
 from view_config_manager import ViewConfigManager
+from image_cache import image_cache
 from settings_dialog import SettingsDialog
 from ui_styles_complete import *
 
+if OPENCV_AVAILABLE:
+    from opencv_video_player import decoder_registry, apply_playback_settings
+    from presentation_clock import master_clock
+    from clip_cache import clip_cache
+    from prerender import prerender_store
+
 class MainController(QMainWindow):
     
     def __init__(self):
@@ -23,6 +31,9 @@ class MainController(QMainWindow):
         # 线程化内容窗口管理
         self.content_windows = {}
         
+        # 拼接视频分组: 视频路径 -> 参与拼接的屏幕索引集合
+        self.span_groups = {}
+        
         self.view_config_manager = ViewConfigManager()
         # 设置ViewConfigManager的父级引用，以便调用apply_content
         self.view_config_manager.main_controller = self
@@ -379,8 +390,13 @@ class MainController(QMainWindow):
             if hasattr(self, 'screens') and screen_index < len(self.screens):
                 screen_info = self.screens[screen_index]
                 
-                # 创建内容窗口
-                content_window = ThreadedContentWindow(screen_index, screen_info)
+                # 创建内容窗口；进程隔离模式下窗口运行在独立的渲染子进程中
+                if self.current_settings.get("renderer_processes", False):
+                    content_window = RendererProxy(screen_index, self.current_settings)
+                    content_window.status_message.connect(self.log_message)
+                else:
+                    content_window = ThreadedContentWindow(screen_index, screen_info)
+                    content_window.apply_settings(self.current_settings)
                 content_window.window_closed.connect(self.on_content_window_closed)
                 self.content_windows[screen_index] = content_window
                 
@@ -401,6 +417,8 @@ class MainController(QMainWindow):
         
         if screen_index in self.content_windows:
             window = self.content_windows[screen_index]
+            # 拼接分块需在窗口创建播放器之前确定
+            self.update_span_groups(screen_index, content if content_type == "拼接视频" else None)
             window.set_content(content_type, content)
             window.show()
             self.log_message(f"✅ 屏幕 {screen_index + 1} 已应用{content_type}内容", "SUCCESS")
@@ -410,10 +428,38 @@ class MainController(QMainWindow):
         else:
             self.log_message(f"❌ 无法为屏幕 {screen_index + 1} 创建内容窗口", "ERROR")
             
+    def update_span_groups(self, screen_index, span_path=None):
+        """更新屏幕所属的拼接分组，并按真实屏幕坐标重新计算各组分块"""
+        for path in list(self.span_groups):
+            self.span_groups[path].discard(screen_index)
+            if not self.span_groups[path]:
+                del self.span_groups[path]
+        if span_path:
+            self.span_groups.setdefault(span_path, set()).add(screen_index)
+            
+        for path, indices in self.span_groups.items():
+            canvas_size, tiles = self.screen_manager.get_span_layout(sorted(indices))
+            for index, tile_rect in tiles.items():
+                if index in self.content_windows:
+                    self.content_windows[index].set_span_tile(canvas_size, tile_rect)
+            if screen_index in indices:
+                self.log_message(f"🧩 拼接视频 {os.path.basename(path)}: 屏幕 {', '.join(str(i + 1) for i in sorted(indices))}，画布 {canvas_size[0]}x{canvas_size[1]}", "INFO")
+        
     def apply_saved_config(self, screens_config):
         """应用保存的配置 - 只为有内容的屏幕创建窗口"""
         self.log_message("📂 开始应用保存的配置...", "INFO")
         
+        # 同一文件共用一路解码，按本次新建的解码器数设置同步启动屏障（主时钟只在本进程内有效）；
+        # 已在解码的文件直接复用现有解码器，不会到达屏障
+        if (OPENCV_AVAILABLE and self.current_settings.get("sync_video_start", True)
+                and not self.current_settings.get("renderer_processes", False)):
+            video_paths = {config.get('content', '') for config in screens_config.values()
+                           if config.get('content_type') in ("视频", "拼接视频") and config.get('content', '').strip()}
+            video_paths = {path for path in video_paths if not decoder_registry.is_decoding(path)}
+            if len(video_paths) > 1:
+                master_clock.arm_start_barrier(len(video_paths), timeout=5.0)
+                self.log_message(f"⏱️ {len(video_paths)} 路视频将同步启动", "INFO")
+        
         applied_count = 0
         for screen_index_str, config in screens_config.items():
             try:
@@ -430,7 +476,7 @@ class MainController(QMainWindow):
                     # 如果屏幕有窗口但配置为无内容，关闭该窗口
                     if screen_index in self.content_windows:
                         self.content_windows[screen_index].close()
-                        del self.content_windows[screen_index]
+                        self.content_windows.pop(screen_index, None)
                         self.log_message(f"🚫 屏幕 {screen_index + 1} 无内容，关闭窗口", "INFO")
                     
             except (ValueError, KeyError) as e:
@@ -477,6 +523,7 @@ class MainController(QMainWindow):
         """处理内容窗口关闭事件"""
         if screen_index in self.content_windows:
             del self.content_windows[screen_index]
+        self.update_span_groups(screen_index)
         self.log_message(f"📄 屏幕 {screen_index + 1} 窗口已关闭", "INFO")
         
     def on_screen_selected_from_view(self, screen_index):
@@ -556,6 +603,47 @@ class MainController(QMainWindow):
         window_count = len(self.content_windows)
         if window_count > 0:
             self.log_message(f"📊 当前运行 {window_count} 个内容窗口", "INFO")
+            # 进程隔离模式下的统计由渲染子进程定期上报，经代理读取
+            image_sources = [("", image_cache.get_stats())]
+            for screen_index, window in self.content_windows.items():
+                queue_stats = window.get_queue_stats()
+                if queue_stats and (queue_stats['queue_coalesced'] or queue_stats['queue_depth'] > 1):
+                    self.log_message(
+                        f"📥 屏幕 {screen_index + 1} 内容命令队列: 深度 {queue_stats['queue_depth']}（峰值 {queue_stats['queue_peak_depth']}），"
+                        f"合并 {queue_stats['queue_coalesced']} 条，平均延迟 {queue_stats['queue_avg_latency_ms']:.0f}ms，"
+                        f"最大 {queue_stats['queue_max_latency_ms']:.0f}ms", "INFO")
+                swap_stats = window.get_swap_stats()
+                if swap_stats:
+                    summary = "，".join(f"{content_type} 平均{stats['avg_ms']:.0f}ms/最大{stats['max_ms']:.0f}ms"
+                                       for content_type, stats in swap_stats.items())
+                    timeouts = sum(stats['timeouts'] for stats in swap_stats.values())
+                    self.log_message(f"🔀 屏幕 {screen_index + 1} 内容切换耗时: {summary}", "INFO")
+                    if timeouts:
+                        self.log_message(f"⚠️ 屏幕 {screen_index + 1} 有 {timeouts} 次预卷超时后强制切换", "WARNING")
+                if isinstance(window, RendererProxy):
+                    image_sources.append((f"屏幕 {screen_index + 1} ", window.get_image_cache_stats()))
+            for label, image_stats in image_sources:
+                if image_stats and (image_stats['image_hits'] or image_stats['image_misses']):
+                    self.log_message(
+                        f"🖼️ {label}图片缓存 {image_stats['image_entries']} 张，{image_stats['image_bytes'] / 1024 / 1024:.0f}/"
+                        f"{image_stats['image_budget_bytes'] / 1024 / 1024:.0f}MB，命中 {image_stats['image_hits']} 次，"
+                        f"未命中 {image_stats['image_misses']} 次，淘汰 {image_stats['image_evictions']} 次", "INFO")
+            if OPENCV_AVAILABLE:
+                stats = decoder_registry.get_stats()
+                if stats['shared_decoders']:
+                    self.log_message(f"🎞️ 视频解码器 {stats['shared_decoders']} 个，服务 {stats['subscribers']} 个窗口", "INFO")
+                cache_stats = clip_cache.get_stats()
+                if cache_stats['clip_cache_enabled']:
+                    self.log_message(
+                        f"🗃️ 短视频缓存 {cache_stats['clip_entries']} 段，{cache_stats['clip_bytes'] / 1024 / 1024:.0f}/"
+                        f"{cache_stats['clip_budget_bytes'] / 1024 / 1024:.0f}MB，命中 {cache_stats['clip_hits']} 次，"
+                        f"未命中 {cache_stats['clip_misses']} 次，淘汰 {cache_stats['clip_evictions']} 次", "INFO")
+                prerender_stats = prerender_store.get_stats()
+                if prerender_stats['prerender_pending']:
+                    self.log_message(f"🛠️ 正在预渲染视频，队列中 {prerender_stats['prerender_pending']} 个", "INFO")
+                clock_stats = master_clock.get_stats()
+                if clock_stats['members'] > 1:
+                    self.log_message(f"⏱️ 屏间最大偏差 {clock_stats['max_skew_ms']}ms（峰值 {clock_stats['peak_skew_ms']}ms）", "INFO")
     
     def show_settings_dialog(self):
         """显示设置对话框"""
@@ -580,7 +668,11 @@ class MainController(QMainWindow):
     def apply_settings(self, settings):
         """应用设置"""
         self.current_settings = settings
-        # 这里可以添加设置应用逻辑
+        image_cache.configure(settings.get("image_cache", True), settings.get("image_cache_mb", 128))
+        if OPENCV_AVAILABLE:
+            apply_playback_settings(settings)
+        for window in self.content_windows.values():
+            window.apply_settings(settings)
     
     def save_window_state(self):
         """保存窗口状态"""
@@ -722,4 +814,11 @@ def start_with_splash():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # 解码子进程在打包后的程序中也从入口文件启动
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 3 and sys.argv[1] == "--renderer":
+        # 进程隔离模式下的屏幕渲染子进程
+        from renderer_process import run_renderer
+        sys.exit(run_renderer(sys.argv[2], int(sys.argv[3])))
     start_with_splash()
\ No newline at end of file
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+媒体探测缓存
+所有播放器共用的视频元数据（时长、帧率、编码、分辨率、关键帧统计等），
+按 路径 + 大小 + 修改时间 持久化到cache目录，文件未变化时重复应用配置不再探测；
+更新先记在内存中，合并后延迟批量写盘
+"""
+
+import os
+import json
+import atexit
+import subprocess
+import threading
+
+CACHE_DIR = "cache"
+PROBE_CACHE_FILE = os.path.join(CACHE_DIR, "media_probe.json")
+SAVE_DELAY = 2.0   # 更新后延迟写盘的时间（秒），期间的多次更新合并为一次写入
+
+# 常见容器的文件头特征
+_SIGNATURES = (
+    (4, b"ftyp", "mp4/mov"),
+    (0, b"RIFF", "avi"),
+    (0, b"\x1a\x45\xdf\xa3", "mkv/webm"),
+    (0, b"FLV", "flv"),
+    (0, b"\x30\x26\xb2\x75", "wmv/asf"),
+)
+
+
+class MediaProbe:
+    """视频元数据探测与持久化缓存"""
+
+    def __init__(self, path=PROBE_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = set()        # 尚未写盘的缓存键
+        self._save_timer = None
+        self.ffprobe_available = True
+        atexit.register(self.flush)
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.probes = 0
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._entries = json.load(f)
+            except Exception as e:
+                print(f"加载媒体探测缓存失败: {e}")
+
+    def _schedule_save(self):
+        """延迟写盘；调用方持有锁"""
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """把尚未写盘的更新写入磁盘（定时器到期、进程退出时调用）"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            # 渲染子进程与解码进程也会写入：以磁盘上的最新内容为底，只覆盖本进程更新过的条目
+            ours = {key: self._entries[key] for key in self._dirty if key in self._entries}
+            self._entries = None
+            self._load()
+            self._entries.update(ours)
+            self._dirty.clear()
+            self._save()
+
+    def _save(self):
+        """写入磁盘；调用方持有锁"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # 先写临时文件再替换，其他进程不会读到半个文件
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"保存媒体探测缓存失败: {e}")
+
+    def _key(self, video_path):
+        """返回 (缓存键, 文件大小, 修改时间)；文件不存在时返回None"""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        return os.path.normcase(os.path.abspath(video_path)), stat.st_size, stat.st_mtime
+
+    def get(self, video_path):
+        """只查缓存：文件未变化时返回已知元数据，否则返回None"""
+        key = self._key(video_path)
+        if key is None:
+            return None
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key[0])
+            if entry and entry.get('size') == key[1] and entry.get('mtime') == key[2]:
+                self.hits += 1
+                return dict(entry)
+            self.misses += 1
+            return None
+
+    def update(self, video_path, **fields):
+        """合并新获得的元数据（如播放器打开文件后得到的帧率、关键帧索引统计）"""
+        key = self._key(video_path)
+        if key is None:
+            return
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key[0])
+            if not entry or entry.get('size') != key[1] or entry.get('mtime') != key[2]:
+                # 文件已变化，旧元数据全部作废
+                entry = {'size': key[1], 'mtime': key[2]}
+            entry.update({k: v for k, v in fields.items() if v is not None})
+            self._entries[key[0]] = entry
+            self._dirty.add(key[0])
+            self._schedule_save()
+
+    def check_header(self, video_path):
+        """文件头检查：返回容器类型，文件过小或不可读时返回None；结果随元数据缓存"""
+        info = self.get(video_path)
+        if info and 'container' in info:
+            return info['container']
+        with open(video_path, 'rb') as f:
+            header = f.read(12)
+        if len(header) < 4:
+            return None
+        container = "unknown"
+        for offset, signature, name in _SIGNATURES:
+            if header[offset:offset + len(signature)] == signature:
+                container = name
+                break
+        self.update(video_path, container=container)
+        return container
+
+    def probe(self, video_path):
+        """获取完整元数据：优先使用缓存，否则用ffprobe探测（可能耗时，勿在界面线程中首次调用）"""
+        info = self.get(video_path)
+        if info and 'codec' in info and 'duration' in info:
+            return info
+        fields = self._run_ffprobe(video_path)
+        if fields is None:
+            return info or {}
+        self.probes += 1
+        self.update(video_path, **fields)
+        return self.get(video_path) or {}
+
+    def _run_ffprobe(self, video_path):
+        if not self.ffprobe_available:
+            return None
+        cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', video_path]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        except FileNotFoundError:
+            self.ffprobe_available = False
+            return None
+        except Exception as e:
+            print(f"ffprobe探测失败: {e}")
+            return None
+        if result.returncode != 0:
+            return None
+
+        data = json.loads(result.stdout)
+        format_info = data.get('format', {})
+        stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), {})
+        fps = None
+        rate = stream.get('avg_frame_rate') or stream.get('r_frame_rate') or ""
+        if "/" in rate:
+            num, den = rate.split("/", 1)
+            if float(den or 0):
+                fps = float(num) / float(den)
+        duration = format_info.get('duration') or stream.get('duration')
+        return {
+            'duration': float(duration) if duration not in (None, 'N/A') else None,
+            'fps': fps,
+            'frame_count': int(stream['nb_frames']) if str(stream.get('nb_frames', '')).isdigit() else None,
+            'codec': stream.get('codec_name'),
+            'width': stream.get('width'),
+            'height': stream.get('height'),
+            'format_name': format_info.get('format_name'),
+        }
+
+    def get_stats(self):
+        """获取探测缓存统计"""
+        with self._lock:
+            self._load()
+            return {
+                'probe_entries': len(self._entries),
+                'probe_hits': self.hits,
+                'probe_misses': self.misses,
+                'probe_runs': self.probes,
+            }
+
+
+# 进程内共享的媒体探测缓存
+media_probe = MediaProbe()
+
+
+__all__ = ['MediaProbe', 'media_probe']
@@ -7,93 +7,358 @@
 import cv2
 import os
 import sys
+import time
 import numpy as np
+from threading import Thread, Lock
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
+from frame_buffer import FrameRingBuffer, FramePool, FrameMailbox
+from presentation_clock import PresentationClock, master_clock
+from frame_sources import open_source, set_process_decode
+from load_governor import LoadGovernor
+from decoder_backends import set_hardware_acceleration
+from clip_cache import clip_cache, STORAGE_RAM, STORAGE_MEMMAP
+from prerender import prerender_store
+
+# OpenGL渲染后端可选，不可用时使用标签绘制
+try:
+    from gl_video_surface import GLVideoSurface, gl_available
+    GL_SURFACE_AVAILABLE = True
+except ImportError as e:
+    GL_SURFACE_AVAILABLE = False
+    print(f"OpenGL视频表面导入失败: {e}")
+
+class FrameSubscriber(QObject):
+    """解码输出订阅者：每个显示窗口一个，按各自尺寸缩放并使用独立缓冲池"""
+    
+    frameAvailable = pyqtSignal()  # 信箱中有新帧，界面端用take_frame()取出，显示完毕后release()
+    
+    def __init__(self, pool_size=4, mailbox_depth=1):
+        super().__init__()
+        # 输出目标尺寸（由界面线程推送），颜色转换与缩放在播放线程完成
+        self.target_size = (400, 300)
+        
+        # 与界面端共享的RGB缓冲池，稳态播放不再逐帧分配内存
+        self.frame_pool = FramePool(pool_size)
+        self._scaled_bgr = None  # 缩放中间结果的复用缓冲区
+        self.dropped_frames = 0  # 界面端未及时归还缓冲区而丢弃的帧
+        
+        # 发往界面线程的信箱：界面繁忙时新帧覆盖旧帧，排队事件最多一个
+        self.mailbox = FrameMailbox(mailbox_depth)
+        
+        # 负载调节：界面端持续积压时逐级抽帧、快速缩放、降低分辨率
+        self.governor = LoadGovernor()
+        
+        # 拼接模式: (画布宽, 画布高, 分块x, 分块y, 分块宽, 分块高)，单位为屏幕像素
+        self.span_tile = None
+        
+    def set_target_size(self, width, height):
+        """设置输出尺寸（可从界面线程调用）"""
+        if width < 100 or height < 100:
+            width, height = 400, 300
+        self.target_size = (int(width), int(height))
+        
+    def set_span_tile(self, canvas_size, tile_rect):
+        """设置拼接分块：视频等比铺满canvas_size画布，本订阅者只输出tile_rect部分；传None取消"""
+        if canvas_size is None or tile_rect is None:
+            self.span_tile = None
+        else:
+            self.span_tile = tuple(canvas_size) + tuple(tile_rect)
+            
+    def _crop_span(self, frame):
+        """按拼接分块裁剪原始帧（返回视图，不复制）"""
+        src_h, src_w = frame.shape[:2]
+        canvas_w, canvas_h, tile_x, tile_y, tile_w, tile_h = self.span_tile
+        scale = max(canvas_w / src_w, canvas_h / src_h)
+        # 视频按画布中心对齐，超出部分两侧均分
+        offset_x = (src_w * scale - canvas_w) / 2
+        offset_y = (src_h * scale - canvas_h) / 2
+        x0 = min(src_w - 1, max(0, int((tile_x + offset_x) / scale)))
+        y0 = min(src_h - 1, max(0, int((tile_y + offset_y) / scale)))
+        x1 = min(src_w, max(x0 + 1, int(round((tile_x + tile_w + offset_x) / scale))))
+        y1 = min(src_h, max(y0 + 1, int(round((tile_y + tile_h + offset_y) / scale))))
+        return frame[y0:y1, x0:x1]
+        
+    def deliver(self, frame, frame_index):
+        """在播放线程中转换一帧并发送；缓冲池被界面端占满时丢弃本帧"""
+        if not self.governor.should_deliver():
+            return False
+        pooled = self._convert_frame(frame)
+        if pooled is None:
+            self.governor.record(False)
+            self.dropped_frames += 1
+            return False
+        pooled.frame_index = frame_index
+        pooled.smooth = not self.governor.fast_scaling
+        wake, superseded = self.mailbox.post(pooled)
+        self.governor.record(not superseded)
+        if wake:
+            self.frameAvailable.emit()
+        return True
+        
+    def take_frame(self):
+        """界面线程取出信箱中的帧"""
+        return self.mailbox.take()
+        
+    def _convert_frame(self, frame):
+        """BGR帧按比例缩放到目标尺寸，转换为RGB写入池化缓冲区；无空闲缓冲区时返回None"""
+        if self.span_tile is not None:
+            frame = self._crop_span(frame)
+        src_h, src_w = frame.shape[:2]
+        target_w, target_h = self.target_size
+        scale = min(target_w / src_w, target_h / src_h) * self.governor.resolution_scale
+        out_w = max(1, int(src_w * scale))
+        out_h = max(1, int(src_h * scale))
+        
+        # 多个订阅者共用一个播放线程，不能因单个窗口卡住而等待
+        pooled = self.frame_pool.acquire(out_w, out_h, timeout=0)
+        if pooled is None:
+            return None
+            
+        if (out_w, out_h) != (src_w, src_h):
+            if self._scaled_bgr is None or self._scaled_bgr.shape[:2] != (out_h, out_w):
+                self._scaled_bgr = np.empty((out_h, out_w, 3), dtype=np.uint8)
+            # 缩小用区域插值（等效平滑缩放），放大用双线性；负载过高时改用最近邻
+            if self.governor.fast_scaling:
+                interpolation = cv2.INTER_NEAREST
+            else:
+                interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, (out_w, out_h), dst=self._scaled_bgr, interpolation=interpolation)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pooled.array)
+        return pooled
+        
+    def get_stats(self):
+        """获取订阅者统计"""
+        stats = self.frame_pool.get_stats()
+        stats['dropped_frames'] = self.dropped_frames
+        stats.update(self.mailbox.get_stats())
+        stats.update(self.governor.get_stats())
+        return stats
+
 class OpenCVVideoThread(QThread):
-    """OpenCV视频播放线程"""
+    """OpenCV视频播放线程 - 一路解码可分发给多个订阅者"""
     
-    frameReady = pyqtSignal(np.ndarray)
     positionChanged = pyqtSignal(int)
     durationChanged = pyqtSignal(int)
     finished = pyqtSignal()
     error = pyqtSignal(str)
     
-    def __init__(self):
+    def __init__(self, buffer_depth=8, buffer_max_bytes=256 * 1024 * 1024, loop_mode="gapless"):
         super().__init__()
         self.video_path = None
-        self.cap = None
+        self.source = None
+        self.loop_mode = loop_mode
+        self.display_size = None  # 订阅者中最大的显示分辨率（宽, 高），短视频缓存按此分辨率录入
         self.playing = False
+        self.stopping = False     # stop()已调用，同步启动屏障上的等待随之退出
         self.paused = False
         self.current_frame = 0
         self.total_frames = 0
         self.fps = 30
         self.seek_frame = -1
         
+        # 预卷：开始按时钟出帧前先解码的帧数，首帧显示后不会立即欠载
+        self.preroll_frames = 3
+        self.preroll_time = 0.0  # 打开文件到预卷完成的耗时（秒）
+        
+        # 解码预读缓冲区，解码线程提前填充，本线程按帧率取帧
+        self.frame_buffer = FrameRingBuffer(buffer_depth, buffer_max_bytes)
+        self.decoder_thread = None
+        self.decode_stalls = 0  # 单次读帧耗时超过一帧间隔的次数
+        
+        # 单调时钟展示调度，按绝对截止时间出帧，避免累计漂移
+        self.clock = PresentationClock()
+        
+        # 帧订阅者（每个显示窗口一个），由界面线程增删
+        self.subscribers = []
+        self._subscribers_lock = Lock()
+        
     def load_video(self, video_path):
         """加载视频"""
         self.video_path = video_path
         
+    def request_display_size(self, size):
+        """登记订阅者的显示分辨率，取所有订阅者中最大的；解码已开始后才变大时通知帧源放弃较小分辨率的录入"""
+        if self.display_size is not None and size[0] <= self.display_size[0] and size[1] <= self.display_size[1]:
+            return
+        if self.display_size is None:
+            self.display_size = tuple(size)
+        else:
+            self.display_size = (max(size[0], self.display_size[0]), max(size[1], self.display_size[1]))
+        source = self.source
+        if source is not None and hasattr(source, 'set_display_size'):
+            source.set_display_size(self.display_size)
+        
     def run(self):
-        """播放线程主循环"""
+        """播放线程主循环 - 从预读缓冲区取帧并按帧率展示"""
         try:
             if not self.video_path or not os.path.exists(self.video_path):
                 self.error.emit("视频文件不存在")
                 return
                 
-            # 打开视频文件
-            self.cap = cv2.VideoCapture(self.video_path)
-            
-            if not self.cap.isOpened():
+            open_start = time.perf_counter()
+            # 打开视频文件（按设置尝试硬件解码，不可用时回退软件解码）
+            self.source = open_source(self.video_path, self.loop_mode, self.display_size)
+            if not self.source.open():
                 self.error.emit("无法打开视频文件")
                 return
                 
             # 获取视频信息
-            self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+            self.total_frames = self.source.total_frames
+            self.fps = self.source.fps
             duration = int(self.total_frames / self.fps)
             
             self.durationChanged.emit(duration)
             
-            print(f"视频信息: {self.total_frames}帧, {self.fps}fps, {duration}秒")
+            print(f"视频信息: {self.total_frames}帧, {self.fps}fps, {duration}秒, 解码: {self.source.backend}, 循环: {self.source.loop_mode}")
+            
+            # 加入跨屏主时钟
+            master_clock.register(id(self), os.path.basename(self.video_path))
+            master_clock.set_duration(id(self), self.total_frames / self.fps)
+            
+            # 读取首帧以确定缓冲区尺寸
+            first_index, first_frame = self.source.read()
+            if first_frame is None:
+                self.error.emit("无法读取视频帧")
+                return
+            self.frame_buffer.allocate(first_frame.shape, first_frame.dtype)
+            slot = self.frame_buffer.begin_write()
+            np.copyto(slot, first_frame)
+            self.frame_buffer.end_write(first_index)
             
             self.playing = True
-            frame_delay = int(1000 / self.fps)  # 毫秒
+            self.clock.set_fps(self.fps)
             
-            while self.playing and self.cap.isOpened():
-                if self.seek_frame >= 0:
-                    # 跳转到指定帧
-                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.seek_frame)
-                    self.current_frame = self.seek_frame
-                    self.seek_frame = -1
-                
-                if not self.paused:
-                    ret, frame = self.cap.read()
+            # 启动解码线程
+            self.decoder_thread = Thread(target=self._decode_loop, daemon=True)
+            self.decoder_thread.start()
+            
+            # 预卷首批帧后再开始计时
+            if self.preroll_frames > 1:
+                self.frame_buffer.wait_fill(self.preroll_frames, timeout=1.0)
+            self.preroll_time = time.perf_counter() - open_start
+            
+            # 首帧就绪后等待同步启动屏障，与其他屏幕共用同一起点
+            self.clock.start(master_clock.wait_start(lambda: self.stopping))
+            last_index = 0
+            was_paused = False
+            while self.playing:
+                if self.paused:
+                    was_paused = True
+                    self.msleep(20)
+                    continue
+                if was_paused:
+                    # 暂停恢复后重新对齐截止时间，避免追帧
+                    self.clock.rebase()
+                    was_paused = False
                     
-                    if not ret:
-                        # 视频结束，循环播放
-                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                        self.current_frame = 0
-                        continue
+                # 等待本帧的绝对截止时间，落后时丢弃已过期的帧
+                skip = self.clock.wait_next()
+                for _ in range(skip):
+                    if self.frame_buffer.begin_read(timeout=0) is None:
+                        break
+                    self.frame_buffer.end_read()
                     
-                    # 发送帧数据
-                    self.frameReady.emit(frame)
-                    self.positionChanged.emit(self.current_frame)
+                item = self.frame_buffer.begin_read(timeout=self.clock.interval)
+                if item is None:
+                    # 缓冲区欠载，本帧无新画面
+                    continue
+                slot, frame_index = item
+                if frame_index == 0 and last_index > 0 and master_clock.align_loops:
+                    # 循环点对齐：保持上一帧画面，等到公共循环起点再播放第0帧
+                    self.clock.start(master_clock.next_loop_boundary(tolerance=self.clock.interval))
+                    self.clock.wait_next()
+                last_index = frame_index
+                try:
+                    # 同一解码帧按各订阅者的尺寸分别转换发送
+                    with self._subscribers_lock:
+                        subscribers = list(self.subscribers)
+                    for subscriber in subscribers:
+                        subscriber.deliver(slot, frame_index)
+                finally:
+                    self.frame_buffer.end_read()
                     
-                    self.current_frame += 1
-                
-                # 控制播放速度
-                self.msleep(frame_delay)
+                master_clock.report(id(self), self.clock.deadline(self.clock.frame_number - 1), time.perf_counter())
+                self.current_frame = frame_index
+                self.positionChanged.emit(self.current_frame)
                 
         except Exception as e:
             self.error.emit(f"播放错误: {str(e)}")
         finally:
-            if self.cap:
-                self.cap.release()
+            self.playing = False
+            master_clock.unregister(id(self))
+            self.frame_buffer.close()
+            if self.decoder_thread:
+                self.decoder_thread.join()
+                self.decoder_thread = None
+            if self.source:
+                self.source.release()
             self.finished.emit()
             
+    def _decode_loop(self):
+        """解码线程 - 提前解码帧并写入环形缓冲区"""
+        frame_interval = 1.0 / self.fps
+        try:
+            while self.playing:
+                if self.seek_frame >= 0:
+                    # 跳转到指定帧，丢弃已预读的旧帧
+                    self.source.seek(self.seek_frame)
+                    self.seek_frame = -1
+                    self.frame_buffer.clear()
+                    self.clock.rebase()
+                    
+                slot = self.frame_buffer.begin_write(timeout=0.1)
+                if slot is None:
+                    continue
+                    
+                # 帧源直接解码到槽位中，到结尾时自行循环
+                start = time.perf_counter()
+                frame_index, frame = self.source.read(slot)
+                if time.perf_counter() - start > frame_interval:
+                    self.decode_stalls += 1
+                
+                if frame is None:
+                    print("读取视频帧失败，停止解码")
+                    self.playing = False
+                    break
+                if frame is not slot:
+                    # 分辨率中途变化等情况，跳过无法放入槽位的帧
+                    continue
+                    
+                self.frame_buffer.end_write(frame_index)
+        except Exception as e:
+            print(f"解码线程错误: {e}")
+            self.playing = False
+            
+    def add_subscriber(self, subscriber):
+        """添加帧订阅者"""
+        with self._subscribers_lock:
+            if subscriber not in self.subscribers:
+                self.subscribers.append(subscriber)
+                
+    def remove_subscriber(self, subscriber):
+        """移除帧订阅者，返回剩余订阅者数量"""
+        with self._subscribers_lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+            return len(self.subscribers)
+            
+    def get_buffer_stats(self):
+        """获取预读缓冲区与解码统计"""
+        stats = self.frame_buffer.get_stats()
+        stats['decode_stalls'] = self.decode_stalls
+        stats['preroll_ms'] = round(self.preroll_time * 1000, 1)
+        if self.source:
+            stats.update(self.source.get_stats())
+        stats['subscribers'] = len(self.subscribers)
+        return stats
+        
+    def get_timing_stats(self):
+        """获取展示时钟统计（实测帧率、延迟、跳帧数）"""
+        return self.clock.get_stats()
+            
     def play(self):
         """播放"""
         self.paused = False
@@ -104,7 +369,11 @@ class OpenCVVideoThread(QThread):
         
     def stop(self):
         """停止"""
+        self.stopping = True
         self.playing = False
+        self.clock.cancel()
+        self.frame_buffer.close()
+        master_clock.wake()
         self.wait()
         
     def seek(self, frame_number):
@@ -112,13 +381,140 @@ class OpenCVVideoThread(QThread):
         if 0 <= frame_number < self.total_frames:
             self.seek_frame = frame_number
 
+class SharedDecoderRegistry:
+    """共享解码器注册表：同一文件+选项只解码一次，按订阅者引用计数"""
+    
+    def __init__(self):
+        self.decoders = {}
+        
+    def _make_key(self, video_path, options):
+        return (os.path.normcase(os.path.abspath(video_path)), tuple(sorted(options.items())))
+        
+    def acquire(self, video_path, subscriber, **options):
+        """获取（必要时创建）解码线程并添加订阅者，返回 (线程, 是否新建)"""
+        key = self._make_key(video_path, options)
+        thread = self.decoders.get(key)
+        created = thread is None
+        if created:
+            thread = OpenCVVideoThread(**options)
+            thread.load_video(video_path)
+            self.decoders[key] = thread
+            # 线程异常退出后从注册表移除，下次重新创建
+            thread.finished.connect(lambda: self._discard(key, thread))
+        else:
+            print(f"复用共享解码器: {os.path.basename(video_path)}（{len(thread.subscribers) + 1}个订阅者）")
+        thread.add_subscriber(subscriber)
+        return thread, created
+        
+    def is_decoding(self, video_path):
+        """该文件是否已有解码线程（新的订阅者直接复用，不会经过同步启动屏障）"""
+        path = os.path.normcase(os.path.abspath(video_path))
+        return any(key[0] == path for key in self.decoders)
+        
+    def release(self, thread, subscriber):
+        """移除订阅者，最后一个订阅者离开时停止解码"""
+        if thread.remove_subscriber(subscriber) == 0:
+            for key, value in list(self.decoders.items()):
+                if value is thread:
+                    del self.decoders[key]
+            thread.stop()
+            
+    def _discard(self, key, thread):
+        if self.decoders.get(key) is thread:
+            del self.decoders[key]
+            
+    def get_stats(self):
+        """获取注册表统计"""
+        return {
+            'shared_decoders': len(self.decoders),
+            'subscribers': sum(len(t.subscribers) for t in self.decoders.values()),
+        }
+
+# 进程内唯一的共享解码器注册表
+decoder_registry = SharedDecoderRegistry()
+
+
+def apply_playback_settings(settings):
+    """把settings.json中的视频播放相关设置应用到本进程（主程序与渲染子进程共用）"""
+    master_clock.align_loops = settings.get("align_video_loops", False)
+    set_hardware_acceleration(settings.get("hardware_acceleration", True))
+    clip_cache.configure(
+        settings.get("clip_cache", False),
+        settings.get("clip_cache_mb", 512),
+        STORAGE_MEMMAP if settings.get("clip_cache_storage") == "磁盘映射" else STORAGE_RAM)
+    prerender_store.enabled = settings.get("prerender_videos", False)
+    set_process_decode(settings.get("process_decode", False))
+
+class VideoFrameLabel(QLabel):
+    """直接绘制池化帧的视频标签，不经过QPixmap转换"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.current_frame = None
+        
+    def present(self, frame):
+        """显示新帧，并归还上一帧的缓冲区"""
+        previous = self.current_frame
+        self.current_frame = frame
+        if previous is not None:
+            previous.release()
+        self.update()
+        
+    def clear_frame(self):
+        """清除画面，归还缓冲区"""
+        if self.current_frame is not None:
+            self.current_frame.release()
+            self.current_frame = None
+        self.update()
+        
+    def paintEvent(self, event):
+        """居中绘制当前帧；无帧时按普通标签绘制文字"""
+        if self.current_frame is None:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.black)
+        image = self.current_frame.image
+        size = image.size()
+        if size.width() < self.width() and size.height() < self.height():
+            # 降低分辨率输出时等比放大到标签尺寸
+            size = size.scaled(self.size(), Qt.KeepAspectRatio)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, self.current_frame.smooth)
+        x = (self.width() - size.width()) // 2
+        y = (self.height() - size.height()) // 2
+        painter.drawImage(QRect(x, y, size.width(), size.height()), image)
+        painter.end()
+        
+    def get_stats(self):
+        """获取渲染统计"""
+        return {'render_backend': 'label'}
+
 class OpenCVVideoPlayer(QWidget):
     """OpenCV视频播放器组件"""
     
-    def __init__(self, parent=None):
+    firstFrameReady = pyqtSignal()  # 预卷完成：首帧已提交到显示表面
+    prerollFailed = pyqtSignal(str)  # 预卷期间播放出错
+    
+    def __init__(self, parent=None, buffer_depth=8, buffer_max_mb=256, render_backend="auto", loop_mode="gapless"):
         super().__init__(parent)
         self.video_thread = None
+        self.frame_subscriber = None
         self.current_video = None
+        self.span_tile = None  # 拼接模式分块 (画布尺寸, 分块矩形)
+        
+        # 预读缓冲区配置（每个播放器独立）
+        self.buffer_depth = buffer_depth
+        self.buffer_max_bytes = int(buffer_max_mb * 1024 * 1024)
+        
+        # 循环方式: "gapless"（无缝循环）或 "seek"（跳回开头）
+        self.loop_mode = loop_mode
+        
+        # 渲染后端: "auto"（优先OpenGL）、"opengl"、"label"
+        self.render_backend = render_backend
+        self.gl_surface = None
+        
+        # 预卷中：首帧到达时发出firstFrameReady
+        self._preroll_pending = False
         
         self.init_ui()
         
@@ -130,7 +526,7 @@ class OpenCVVideoPlayer(QWidget):
         layout.setContentsMargins(2, 2, 2, 2)  # 减小边距
         
         # 视频显示区域 - 占据整个空间
-        self.video_label = QLabel()
+        self.video_label = VideoFrameLabel()
         self.video_label.setAlignment(Qt.AlignCenter)
         self.video_label.setStyleSheet("""
             QLabel {
@@ -141,16 +537,24 @@ class OpenCVVideoPlayer(QWidget):
         self.video_label.setText("准备播放视频...")
         self.video_label.setMinimumSize(400, 300)
         self.video_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        layout.addWidget(self.video_label)
         
-        # 添加缓存的尺寸和缩放图像
-        self.cached_size = None
-        self.cached_scaled_image = None
+        # 标签用于提示文字及回退渲染，OpenGL表面可用时用于显示视频帧
+        self.video_stack = QStackedWidget()
+        self.video_stack.addWidget(self.video_label)
+        self.video_surface = self.video_label
+        if self.render_backend != "label" and GL_SURFACE_AVAILABLE and gl_available():
+            self.gl_surface = GLVideoSurface()
+            self.gl_surface.initFailed.connect(self._fallback_to_label)
+            self.video_stack.addWidget(self.gl_surface)
+            self.video_surface = self.gl_surface
+        elif self.render_backend == "opengl":
+            print("OpenGL不可用，视频渲染回退到标签绘制")
+        layout.addWidget(self.video_stack)
         
         # 移除所有控制面板、进度条和状态标签
         # 只保留视频显示功能
         
-    def play_video(self, video_path):
+    def play_video(self, video_path, start_delay=300):
         """播放视频"""
         print(f"OpenCV播放器加载视频: {video_path}")
         
@@ -159,84 +563,108 @@ class OpenCVVideoPlayer(QWidget):
         
         self.current_video = video_path
         
-        # 确保界面已完全初始化
-        QApplication.processEvents()
+        if start_delay > 0:
+            # 确保界面已完全初始化
+            QApplication.processEvents()
         
         # 预设视频标签尺寸，避免初始缩放
         if self.video_label.size().width() < 100:
             self.video_label.resize(400, 300)
             
-        # 重置缓存
-        self.cached_size = None
-        self.cached_scaled_image = None
-        
-        # 创建播放线程
-        self.video_thread = OpenCVVideoThread()
-        self.video_thread.load_video(video_path)
+        # 订阅共享解码器：同一文件在多个屏幕上只解码一次
+        self.frame_subscriber = FrameSubscriber()
+        self.frame_subscriber.governor.name = os.path.basename(video_path)
+        self.frame_subscriber.frameAvailable.connect(self.update_frame)
+        if self.span_tile:
+            self.frame_subscriber.set_span_tile(*self.span_tile)
+        self._push_target_size(self.video_stack.size())
+        self.video_thread, created = decoder_registry.acquire(
+            video_path, self.frame_subscriber,
+            buffer_depth=self.buffer_depth, buffer_max_bytes=self.buffer_max_bytes, loop_mode=self.loop_mode)
+        # 短视频缓存按所有订阅者中最大的显示分辨率录入，不受先打开文件的屏幕限制
+        self.video_thread.request_display_size(self._display_size())
         
         # 连接信号
-        self.video_thread.frameReady.connect(self.update_frame)
         self.video_thread.positionChanged.connect(self.update_position)
         self.video_thread.durationChanged.connect(self.update_duration)
         self.video_thread.finished.connect(self.on_playback_finished)
         self.video_thread.error.connect(self.on_playback_error)
         
         # 延迟启动播放，确保界面稳定
-        QTimer.singleShot(300, self._delayed_start)
+        QTimer.singleShot(start_delay, self._delayed_start)
         
         return True
         
+    def preroll(self, video_path, size=None):
+        """离屏预卷：立即打开视频并解码首批帧，首帧到达后发出firstFrameReady；
+        播放器可保持隐藏，调用方收到信号后再一次性切换到本播放器"""
+        self.play_video(video_path, start_delay=0)
+        # play_video()会先stop_video()清除标志，须在其后设置；首帧经排队信号送达，不会早于此处
+        self._preroll_pending = True
+        if size is not None:
+            # 隐藏的控件尚未布局，按最终尺寸推送输出目标
+            self.resize(size)
+            self._push_target_size(size.shrunkBy(self.layout().contentsMargins()))
+        
+    def _display_size(self):
+        """显示分辨率：拼接视频为整个画布，否则为所在屏幕"""
+        if self.span_tile:
+            return self.span_tile[0]
+        geometry = QApplication.desktop().screenGeometry(self)
+        return (geometry.width(), geometry.height())
+        
     def _delayed_start(self):
-        """延迟启动播放"""
-        if self.video_thread:
+        """延迟启动播放（共享解码器已在运行时直接接收帧）"""
+        if self.video_thread and not self.video_thread.isRunning():
             self.video_thread.start()
         
-    def update_frame(self, frame):
-        """更新视频帧"""
+    def update_frame(self):
+        """更新视频帧 - 帧已在播放线程中转换并缩放到池化缓冲区"""
+        if self.frame_subscriber is None:
+            return
+        frame = self.frame_subscriber.take_frame()
+        if frame is None:
+            return
         try:
-            # 转换OpenCV图像为QImage
-            height, width, channels = frame.shape
-            bytes_per_line = channels * width
-            
-            # 从BGR转换为RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            qt_image = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            
-            # 获取当前标签尺寸
-            label_size = self.video_label.size()
-            
-            # 只有当尺寸变化时才重新缩放
-            if self.cached_size != label_size or self.cached_scaled_image is None:
-                # 确保最小尺寸
-                if label_size.width() < 100 or label_size.height() < 100:
-                    label_size = QSize(400, 300)
-                
-                self.cached_size = label_size
-                
-                # 缩放图像以适应标签大小
-                scaled_image = qt_image.scaled(
-                    label_size, 
-                    Qt.KeepAspectRatio, 
-                    Qt.SmoothTransformation
-                )
-                
-                # 缓存基础缩放图像
-                self.cached_scaled_image = scaled_image
-            else:
-                # 使用缓存的尺寸进行快速缩放
-                scaled_image = qt_image.scaled(
-                    self.cached_size, 
-                    Qt.KeepAspectRatio, 
-                    Qt.FastTransformation  # 使用快速变换
-                )
-            
-            # 更新显示
-            pixmap = QPixmap.fromImage(scaled_image)
-            self.video_label.setPixmap(pixmap)
-            
+            self.video_surface.present(frame)
+            if self.video_stack.currentWidget() is not self.video_surface:
+                self.video_stack.setCurrentWidget(self.video_surface)
         except Exception as e:
+            frame.release()
             print(f"更新帧失败: {e}")
+            return
+        if self._preroll_pending:
+            self._preroll_pending = False
+            self.firstFrameReady.emit()
+            
+    def _fallback_to_label(self, reason):
+        """OpenGL表面初始化或绘制失败，切换回标签渲染"""
+        print(f"视频渲染回退到标签绘制: {reason}")
+        if self.gl_surface is not None:
+            self.video_stack.removeWidget(self.gl_surface)
+            self.gl_surface.deleteLater()
+            self.gl_surface = None
+        self.video_surface = self.video_label
+        self.video_stack.setCurrentWidget(self.video_label)
+        
+    def _show_message(self, text):
+        """显示提示文字并清除画面"""
+        if self.gl_surface is not None:
+            self.gl_surface.clear_frame()
+        self.video_label.setText(text)
+        self.video_label.clear_frame()
+        self.video_stack.setCurrentWidget(self.video_label)
+        
+    def set_span_tile(self, canvas_size, tile_rect):
+        """设置拼接模式分块，播放中调用立即生效；参数为None时恢复整幅显示"""
+        self.span_tile = (canvas_size, tile_rect) if canvas_size and tile_rect else None
+        if self.frame_subscriber:
+            self.frame_subscriber.set_span_tile(canvas_size, tile_rect)
+            
+    def _push_target_size(self, size):
+        """把视频显示区域尺寸推送给本播放器的订阅者"""
+        if self.frame_subscriber:
+            self.frame_subscriber.set_target_size(size.width(), size.height())
             
     def update_position(self, frame_number):
         """更新播放位置 - 简化版本"""
@@ -251,13 +679,39 @@ class OpenCVVideoPlayer(QWidget):
                 
     def stop_video(self):
         """停止播放"""
+        self._preroll_pending = False
         if self.video_thread:
-            self.video_thread.stop()
+            # 共享解码器可能仍在为其他屏幕工作，只断开本播放器
+            for signal, slot in ((self.video_thread.positionChanged, self.update_position),
+                                 (self.video_thread.durationChanged, self.update_duration),
+                                 (self.video_thread.finished, self.on_playback_finished),
+                                 (self.video_thread.error, self.on_playback_error)):
+                try:
+                    signal.disconnect(slot)
+                except TypeError:
+                    pass
+            decoder_registry.release(self.video_thread, self.frame_subscriber)
+            self.frame_subscriber.mailbox.clear()
             self.video_thread = None
+            self.frame_subscriber = None
+            
+        self._show_message("视频已停止")
             
-        self.video_label.setText("视频已停止")
-        self.video_label.setPixmap(QPixmap())
+    def seek(self, seconds):
+        """跳转到指定时间（秒），由解码线程按关键帧索引精确定位"""
+        if self.video_thread:
+            self.video_thread.seek(int(seconds * self.video_thread.fps))
             
+    def get_playback_stats(self):
+        """获取播放统计（缓冲区、解码卡顿、实测帧率与延迟）"""
+        if self.video_thread:
+            stats = self.video_thread.get_buffer_stats()
+            stats.update(self.video_thread.get_timing_stats())
+            stats.update(self.frame_subscriber.get_stats())
+            stats.update(self.video_surface.get_stats())
+            return stats
+        return {}
+        
     def on_playback_finished(self):
         """播放完成"""
         print("视频播放完成")
@@ -265,8 +719,10 @@ class OpenCVVideoPlayer(QWidget):
     def on_playback_error(self, error_msg):
         """播放错误"""
         print(f"播放错误: {error_msg}")
-        self.video_label.setText(f"播放错误: {error_msg}")
-        self.video_label.setPixmap(QPixmap())
+        self._show_message(f"播放错误: {error_msg}")
+        if self._preroll_pending:
+            self._preroll_pending = False
+            self.prerollFailed.emit(error_msg)
         
     def cleanup(self):
         """清理资源"""
@@ -315,9 +771,9 @@ class OpenCVVideoPlayer(QWidget):
     def resizeEvent(self, event):
         """窗口尺寸变化事件"""
         super().resizeEvent(event)
-        # 重置缓存，强制重新缩放
-        self.cached_size = None
-        self.cached_scaled_image = None
+        # 布局尚未更新标签尺寸，按边距推算显示区域并推送给播放线程
+        margins = self.layout().contentsMargins()
+        self._push_target_size(event.size().shrunkBy(margins))
         
     def closeEvent(self, event):
         """关闭事件"""
@@ -325,4 +781,4 @@ class OpenCVVideoPlayer(QWidget):
         event.accept()
 
 # 导出主要类
-__all__ = ['OpenCVVideoPlayer']
\ No newline at end of file
+__all__ = ['OpenCVVideoPlayer', 'decoder_registry', 'apply_playback_settings']
\ No newline at end of file
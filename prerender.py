@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+视频预渲染
+把解码负担过重的视频（如高码率HEVC）预先转成按显示分辨率缩放好的原始帧文件，
+播放时用np.memmap按帧切片读取，解码器不再参与播放
+
+文件格式: 固定4096字节文件头（魔数 + JSON索引信息），之后为连续的BGR24帧
+缓存文件按 源路径 + 修改时间 + 目标分辨率 命名，源文件变化后自动失效
+
+也可以在命令行中预先生成:
+    python prerender.py 视频文件 [宽x高]
+"""
+
+import os
+import sys
+import json
+import queue
+import shutil
+import struct
+import hashlib
+import threading
+import cv2
+
+from decoder_backends import open_capture
+
+PRERENDER_DIR = os.path.join("cache", "prerender")
+MAGIC = b"MSPRAW01"
+HEADER_SIZE = 4096
+
+
+def read_header(path):
+    """读取预渲染文件头，返回索引信息字典，文件无效时返回None"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(HEADER_SIZE)
+        if len(head) < HEADER_SIZE or head[:8] != MAGIC:
+            return None
+        length = struct.unpack_from("<I", head, 8)[0]
+        info = json.loads(head[12:12 + length].decode('utf-8'))
+        info['data_offset'] = HEADER_SIZE
+        return info
+    except Exception as e:
+        print(f"读取预渲染文件头失败: {e}")
+        return None
+
+
+def _write_header(f, info):
+    data = json.dumps(info, ensure_ascii=False).encode('utf-8')
+    head = MAGIC + struct.pack("<I", len(data)) + data
+    f.seek(0)
+    f.write(head.ljust(HEADER_SIZE, b"\0"))
+
+
+class PrerenderStore:
+    """预渲染文件缓存与后台转换队列"""
+
+    def __init__(self, directory=PRERENDER_DIR):
+        self.directory = directory
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._worker = None
+
+        # 统计信息
+        self.rendered = 0
+        self.failed = 0
+
+    def cache_path(self, video_path, size):
+        """缓存文件路径；源文件不存在时返回None"""
+        try:
+            mtime = os.path.getmtime(video_path)
+        except OSError:
+            return None
+        key = (os.path.normcase(os.path.abspath(video_path)), mtime, tuple(size or ()))
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{name}.raw")
+
+    def lookup(self, video_path, size):
+        """已完成的预渲染文件路径，没有时返回None"""
+        path = self.cache_path(video_path, size)
+        if path and os.path.exists(path):
+            return path
+        return None
+
+    def request(self, video_path, size):
+        """请求后台预渲染（已存在或已在队列中时忽略）"""
+        path = self.cache_path(video_path, size)
+        if path is None or os.path.exists(path):
+            return
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+            self._queue.put((video_path, size, path))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, daemon=True)
+                self._worker.start()
+
+    def _work(self):
+        """后台转换线程，依次处理队列中的视频"""
+        while True:
+            try:
+                video_path, size, path = self._queue.get(timeout=5)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            try:
+                if render(video_path, path, size):
+                    self.rendered += 1
+                else:
+                    self.failed += 1
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+
+    def get_stats(self):
+        """获取预渲染统计"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'prerender_enabled': self.enabled,
+            'prerender_pending': pending,
+            'prerender_rendered': self.rendered,
+            'prerender_failed': self.failed,
+        }
+
+
+def render(video_path, output_path, size=None, progress=None):
+    """把视频转换为原始帧文件，size为（宽, 高）上限；成功返回True"""
+    cap, backend = open_capture(video_path)
+    if not cap.isOpened():
+        print(f"预渲染失败，无法打开视频: {video_path}")
+        return False
+
+    try:
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        estimated = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if size:
+            scale = min(size[0] / width, size[1] / height, 1.0)
+            width, height = max(1, int(width * scale)), max(1, int(height * scale))
+
+        # 原始帧文件很大，磁盘空间不足时放弃
+        frame_bytes = width * height * 3
+        directory = os.path.dirname(output_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        if estimated * frame_bytes > shutil.disk_usage(directory).free * 0.9:
+            print(f"预渲染跳过，磁盘空间不足: {os.path.basename(video_path)} 需要约 {estimated * frame_bytes / 1024 ** 3:.1f}GB")
+            return False
+
+        print(f"开始预渲染: {os.path.basename(video_path)} -> {width}x{height}（解码: {backend}）")
+        temp_path = output_path + ".part"
+        frame_count = 0
+        with open(temp_path, 'wb') as f:
+            f.write(b"\0" * HEADER_SIZE)
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if frame.shape[1] != width or frame.shape[0] != height:
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+                f.write(frame.tobytes())
+                frame_count += 1
+                if progress and estimated:
+                    progress(frame_count, estimated)
+            _write_header(f, {
+                'width': width,
+                'height': height,
+                'fps': fps,
+                'frame_count': frame_count,
+                'frame_bytes': frame_bytes,
+                'source': os.path.abspath(video_path),
+            })
+
+        if frame_count == 0:
+            os.remove(temp_path)
+            print(f"预渲染失败，没有解码出帧: {video_path}")
+            return False
+        os.replace(temp_path, output_path)
+        print(f"预渲染完成: {os.path.basename(video_path)}，{frame_count}帧，{frame_count * frame_bytes / 1024 ** 2:.0f}MB")
+        return True
+    except Exception as e:
+        print(f"预渲染失败: {e}")
+        return False
+    finally:
+        cap.release()
+
+
+# 进程内唯一的预渲染缓存，由主程序按设置启用
+prerender_store = PrerenderStore()
+
+
+__all__ = ['PrerenderStore', 'prerender_store', 'render', 'read_header']
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("用法: python prerender.py 视频文件 [宽x高]")
+        sys.exit(1)
+    target = tuple(int(v) for v in sys.argv[2].lower().split("x")) if len(sys.argv) > 2 else None
+    path = prerender_store.cache_path(sys.argv[1], target)
+    if path is None:
+        print(f"视频文件不存在: {sys.argv[1]}")
+        sys.exit(1)
+    sys.exit(0 if render(sys.argv[1], path, target) else 1)
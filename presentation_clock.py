@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+展示时钟
+- PresentationClock: 按单调时钟的绝对截止时间安排每一帧，落后时跳帧，只睡眠剩余的空闲时间
+- MasterClock: 跨屏主时钟，提供同步启动屏障、循环点对齐和屏间偏差统计
+"""
+
+import math
+import time
+import threading
+from collections import deque
+
+
+class PresentationClock:
+    """基于单调时钟的逐帧展示调度器"""
+
+    def __init__(self, fps=30, window=120):
+        self.fps = fps or 30
+        self.interval = 1.0 / self.fps
+        self.epoch = None
+        self.frame_number = 0
+        self.cancelled = False
+
+        # 统计信息
+        self.presented_frames = 0
+        self.skipped_frames = 0
+        self.max_lateness = 0.0
+        self._total_lateness = 0.0
+        self._present_times = deque(maxlen=window)
+        self._lateness = deque(maxlen=window)
+
+    def set_fps(self, fps):
+        """设置帧率，保持当前进度不跳变"""
+        self.fps = fps or 30
+        self.interval = 1.0 / self.fps
+        if self.epoch is not None:
+            self.rebase()
+
+    def start(self, epoch=None):
+        """开始计时，第0帧的截止时间为epoch（默认当前时刻）"""
+        self.epoch = time.perf_counter() if epoch is None else epoch
+        self.frame_number = 0
+        self._present_times.clear()
+
+    def cancel(self):
+        """中断正在进行的等待（停止播放时使用）"""
+        self.cancelled = True
+
+    def rebase(self):
+        """以当前时刻为下一帧截止时间重新对齐（暂停恢复、跳转后使用）"""
+        self.epoch = time.perf_counter() - self.frame_number * self.interval
+        self._present_times.clear()
+
+    def deadline(self, frame_number=None):
+        """指定帧的绝对截止时间"""
+        if frame_number is None:
+            frame_number = self.frame_number
+        return self.epoch + frame_number * self.interval
+
+    def wait_next(self):
+        """等待下一帧截止时间，返回因落后需要跳过的帧数"""
+        if self.epoch is None:
+            self.start()
+
+        # 分段睡眠，长时间等待（如循环点对齐）期间也能及时响应停止
+        slack = self.deadline() - time.perf_counter()
+        while slack > 0 and not self.cancelled:
+            time.sleep(min(slack, 0.05))
+            slack = self.deadline() - time.perf_counter()
+
+        now = time.perf_counter()
+        lateness = max(0.0, now - self.deadline())
+        skip = int(lateness / self.interval)
+        if skip:
+            # 落后超过一帧：直接跳到当前应展示的帧
+            self.frame_number += skip
+            self.skipped_frames += skip
+            lateness -= skip * self.interval
+
+        self._record(now, lateness)
+        self.frame_number += 1
+        return skip
+
+    def _record(self, now, lateness):
+        """记录展示时刻与延迟"""
+        self.presented_frames += 1
+        self._present_times.append(now)
+        self._lateness.append(lateness)
+        self._total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+
+    @property
+    def measured_fps(self):
+        """最近窗口内的实测帧率"""
+        if len(self._present_times) < 2:
+            return 0.0
+        span = self._present_times[-1] - self._present_times[0]
+        return (len(self._present_times) - 1) / span if span > 0 else 0.0
+
+    def get_stats(self):
+        """获取时钟统计（延迟单位：毫秒）"""
+        recent = list(self._lateness)
+        return {
+            'target_fps': self.fps,
+            'measured_fps': round(self.measured_fps, 2),
+            'presented_frames': self.presented_frames,
+            'skipped_frames': self.skipped_frames,
+            'avg_lateness_ms': round(self._total_lateness / self.presented_frames * 1000, 2) if self.presented_frames else 0.0,
+            'recent_max_lateness_ms': round(max(recent) * 1000, 2) if recent else 0.0,
+            'max_lateness_ms': round(self.max_lateness * 1000, 2),
+        }
+
+
+class MasterClock:
+    """跨屏主时钟：所有播放线程共享同一时间基准"""
+
+    def __init__(self, start_lead=0.05, report_window=1.0):
+        self.start_lead = start_lead          # 屏障释放到第0帧之间的余量（秒）
+        self.report_window = report_window    # 参与偏差统计的最近上报时间窗（秒）
+        self.align_loops = False              # 循环点对齐：短视频等待最长视频一起重播
+
+        self._cond = threading.Condition()
+        self.epoch = None      # 进程内共享的循环对齐基准：首个成员（或同步启动组）开始的时刻
+        self._members = {}     # 成员ID -> {'name', 'duration', 'offset', 'reported'}
+        self._barrier = None   # {'expected', 'arrived', 'deadline', 'epoch'}
+
+        # 统计信息
+        self.synced_starts = 0
+        self.barrier_timeouts = 0
+        self.peak_skew = 0.0
+
+    def register(self, member_id, name=""):
+        """播放线程加入主时钟"""
+        with self._cond:
+            self._members[member_id] = {'name': name, 'duration': 0.0, 'offset': None, 'reported': 0.0}
+
+    def unregister(self, member_id):
+        """播放线程退出主时钟"""
+        with self._cond:
+            self._members.pop(member_id, None)
+            if not self._members:
+                # 所有播放线程都已退出，下一轮播放重新确定基准
+                self.epoch = None
+            self._cond.notify_all()
+
+    def set_duration(self, member_id, duration):
+        """上报成员视频时长（秒），用于循环点对齐"""
+        with self._cond:
+            if member_id in self._members:
+                self._members[member_id]['duration'] = duration
+
+    @property
+    def loop_period(self):
+        """对齐循环周期：所有成员中最长的视频时长"""
+        with self._cond:
+            return max((m['duration'] for m in self._members.values()), default=0.0)
+
+    def arm_start_barrier(self, expected, timeout=3.0):
+        """准备同步启动：接下来到达的expected个播放线程一起开始；超时后已到达的先开始"""
+        with self._cond:
+            if expected <= 1:
+                self._barrier = None
+                return
+            self._barrier = {
+                'expected': expected,
+                'arrived': 0,
+                'deadline': time.perf_counter() + timeout,
+                'epoch': None,
+            }
+            print(f"主时钟: 等待 {expected} 路视频同步启动")
+
+    def wait_start(self, cancelled=None):
+        """播放线程首帧就绪后调用，返回第0帧的截止时间（单调时钟）；
+        cancelled()为真时（播放线程被停止，需配合wake()）立即退出屏障等待"""
+        with self._cond:
+            barrier = self._barrier
+            if barrier is not None and barrier['arrived'] == 0 and time.perf_counter() > barrier['deadline']:
+                # 屏障超时前无人到达（预期的视频未启动），作废，不拖住之后的启动
+                self._barrier = barrier = None
+            if barrier is None or barrier['epoch'] is not None:
+                # 未设置屏障，或屏障已释放（迟到者）：独立启动
+                now = time.perf_counter()
+                if self.epoch is None:
+                    self.epoch = now
+                return now
+
+            barrier['arrived'] += 1
+            if barrier['arrived'] < barrier['expected']:
+                remaining = barrier['deadline'] - time.perf_counter()
+                self._cond.wait_for(lambda: barrier['epoch'] is not None or (cancelled is not None and cancelled()),
+                                    max(0.0, remaining))
+                if barrier['epoch'] is not None:
+                    return barrier['epoch']
+                if cancelled is not None and cancelled():
+                    # 退出屏障，其余成员不再等待本线程
+                    barrier['arrived'] -= 1
+                    barrier['expected'] -= 1
+                    if 0 < barrier['arrived'] >= barrier['expected']:
+                        self._release(barrier)
+                    return time.perf_counter()
+                self.barrier_timeouts += 1
+                print(f"主时钟: 同步启动超时，{barrier['arrived']}/{barrier['expected']} 路已就绪")
+
+            if barrier['epoch'] is None:
+                self._release(barrier)
+            return barrier['epoch']
+
+    def _release(self, barrier):
+        """释放同步启动屏障；调用方持有锁"""
+        barrier['epoch'] = time.perf_counter() + self.start_lead
+        self.epoch = barrier['epoch']
+        self.synced_starts += 1
+        self._barrier = None
+        self._cond.notify_all()
+
+    def wake(self):
+        """唤醒在屏障上等待的线程，重新检查各自的取消条件"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def next_loop_boundary(self, now=None, tolerance=0.0):
+        """循环点对齐模式下，返回共享基准epoch之后最近的公共循环起点；
+        晚于该起点不超过tolerance（通常为一帧间隔）时仍返回它，最长的视频到达循环点时不必再等一整个周期"""
+        period = self.loop_period
+        now = time.perf_counter() if now is None else now
+        with self._cond:
+            epoch = self.epoch
+        if epoch is None:
+            return now
+        if period <= 0 or now <= epoch:
+            return max(now, epoch)
+        loops = max(0, math.ceil((now - tolerance - epoch) / period))
+        return epoch + loops * period
+
+    def report(self, member_id, deadline, presented_at):
+        """上报一次展示：偏差为实际展示时刻相对共享时间轴上截止时间的差值"""
+        with self._cond:
+            member = self._members.get(member_id)
+            if member is None:
+                return
+            member['offset'] = presented_at - deadline
+            member['reported'] = presented_at
+
+    @property
+    def max_skew(self):
+        """最近时间窗内各屏展示偏差的最大差值（秒）"""
+        now = time.perf_counter()
+        with self._cond:
+            offsets = [m['offset'] for m in self._members.values()
+                       if m['offset'] is not None and now - m['reported'] <= self.report_window]
+        if len(offsets) < 2:
+            return 0.0
+        skew = max(offsets) - min(offsets)
+        self.peak_skew = max(self.peak_skew, skew)
+        return skew
+
+    def get_stats(self):
+        """获取主时钟统计（偏差单位：毫秒）"""
+        skew = self.max_skew
+        with self._cond:
+            members = len(self._members)
+        return {
+            'members': members,
+            'synced_starts': self.synced_starts,
+            'barrier_timeouts': self.barrier_timeouts,
+            'align_loops': self.align_loops,
+            'max_skew_ms': round(skew * 1000, 2),
+            'peak_skew_ms': round(self.peak_skew * 1000, 2),
+        }
+
+
+# 进程内唯一的跨屏主时钟
+master_clock = MasterClock()
+
+
+__all__ = ['PresentationClock', 'MasterClock', 'master_clock']
+
+
+if __name__ == "__main__":
+    # 测试代码：循环点对齐时最长的视频在自身循环点最多等待一帧，较短的视频等到公共循环起点
+    clock = MasterClock()
+    clock.register("long")
+    clock.register("short")
+    clock.set_duration("long", 2.0)
+    clock.set_duration("short", 1.0)
+    clock.epoch = 100.0
+    interval = 1.0 / 30
+
+    for loop in range(1, 4):
+        wrap = clock.epoch + loop * 2.0 + 0.0005
+        wait = clock.next_loop_boundary(wrap, interval) - wrap
+        assert wait <= interval, f"最长视频第{loop}次循环等待 {wait:.3f}s"
+    assert clock.next_loop_boundary(101.0005, interval) == 102.0
+    assert clock.next_loop_boundary(100.5, interval) == 102.0
+    print("循环点对齐测试通过")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+屏幕渲染子进程
+进程隔离模式下每个屏幕的内容窗口运行在独立的子进程中，某个屏幕的WebEngine崩溃或
+OpenCV在坏文件上段错误只影响该屏幕；主控制器通过本地套接字（QLocalSocket）下发命令，
+子进程异常退出后自动重启并重新应用最后的内容
+
+- RendererProxy: 主进程中的代理，对外提供与ThreadedContentWindow相同的接口
+- run_renderer: 子进程入口
+
+通信协议: 每行一个JSON对象
+  主进程 -> 子进程: {"cmd": "settings" | "span_tile" | "set_content" | "show" | "hide" | "close", ...}
+  子进程 -> 主进程: {"event": "closed"} | {"event": "stats", "queue": {...}, "swap": {...}, "image_cache": {...}}
+"""
+
+import os
+import sys
+import json
+import time
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QProcess, QTimer, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+STATS_INTERVAL_MS = 10000  # 子进程上报统计的间隔
+
+
+def _encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+def _renderer_command(server_name, screen_index):
+    """启动子进程的程序与参数；打包后由入口程序按--renderer参数分派"""
+    if getattr(sys, 'frozen', False):
+        return sys.executable, ["--renderer", server_name, str(screen_index)]
+    script = os.path.abspath(__file__)
+    return sys.executable, [script, server_name, str(screen_index)]
+
+
+class RendererProxy(QObject):
+    """渲染子进程代理：记录屏幕的最新状态，子进程（重新）连接后整体下发"""
+
+    window_closed = pyqtSignal(int)
+    status_message = pyqtSignal(str, str)  # (消息, 级别)，显示在主界面日志
+
+    def __init__(self, screen_index, settings=None, max_restarts=5, restart_window=60.0):
+        super().__init__()
+        self.screen_index = screen_index
+        self.settings = dict(settings or {})
+        self.max_restarts = max_restarts        # restart_window秒内最多重启次数
+        self.restart_window = restart_window
+
+        # 需要在重启后恢复的状态
+        self.content = None      # (内容类型, 内容)
+        self.visible = False
+        self.span_tile = None
+
+        self.process = None
+        self.server = None
+        self.socket = None
+        self._buffer = b""
+        self._closing = False
+        self._window_closed = False
+        self._generation = 0
+        self._restart_times = []
+        self.restarts = 0
+        self.child_stats = {}    # 子进程最近一次上报的统计
+
+        self._start()
+
+    def _start(self):
+        """启动子进程，并为其建立专用的本地服务"""
+        self._generation += 1
+        # 回收上一个（已退出的）子进程与本地服务
+        for old in (self.process, self.server):
+            if old is not None:
+                old.deleteLater()
+        server_name = f"msm_renderer_{os.getpid()}_{self.screen_index}_{self._generation}"
+        QLocalServer.removeServer(server_name)
+        self.server = QLocalServer(self)
+        if not self.server.listen(server_name):
+            self.status_message.emit(f"屏幕 {self.screen_index + 1} 渲染进程通道创建失败: {self.server.errorString()}", "ERROR")
+            return
+        self.server.newConnection.connect(self._on_connected)
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.ForwardedChannels)
+        self.process.finished.connect(self._on_finished)
+        program, arguments = _renderer_command(server_name, self.screen_index)
+        self.process.start(program, arguments)
+
+    def _on_connected(self):
+        """子进程已连接：下发设置与最后的状态"""
+        self.socket = self.server.nextPendingConnection()
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.server.close()
+        self._send({'cmd': 'settings', 'settings': self.settings})
+        if self.span_tile:
+            self._send({'cmd': 'span_tile', 'canvas': self.span_tile[0], 'tile': self.span_tile[1]})
+        if self.content:
+            self._send({'cmd': 'set_content', 'content_type': self.content[0], 'content': self.content[1]})
+        self._send({'cmd': 'show' if self.visible else 'hide'})
+
+    def _on_ready_read(self):
+        self._buffer += bytes(self.socket.readAll())
+        while b"\n" in self._buffer:
+            line, self._buffer = self._buffer.split(b"\n", 1)
+            try:
+                message = json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+            if message.get('event') == 'closed':
+                # 用户在子进程窗口中关闭了窗口，不再重启
+                self._window_closed = True
+            elif message.get('event') == 'stats':
+                self.child_stats = message
+
+    def _send(self, message):
+        if self.socket is not None and self.socket.state() == QLocalSocket.ConnectedState:
+            self.socket.write(_encode(message))
+            self.socket.flush()
+
+    def _on_finished(self, exit_code, exit_status):
+        """子进程退出：正常关闭时通知主控制器，否则按频率限制自动重启"""
+        self.socket = None
+        self._buffer = b""
+        if self._closing:
+            return
+        if self._window_closed:
+            self.window_closed.emit(self.screen_index)
+            return
+
+        now = time.monotonic()
+        self._restart_times = [t for t in self._restart_times if now - t < self.restart_window]
+        if len(self._restart_times) >= self.max_restarts:
+            self.status_message.emit(
+                f"屏幕 {self.screen_index + 1} 渲染进程 {self.restart_window:.0f} 秒内崩溃 {len(self._restart_times)} 次，停止重启", "ERROR")
+            self.window_closed.emit(self.screen_index)
+            return
+        self._restart_times.append(now)
+        self.restarts += 1
+        reason = "崩溃" if exit_status == QProcess.CrashExit else f"异常退出（代码 {exit_code}）"
+        self.status_message.emit(f"屏幕 {self.screen_index + 1} 渲染进程{reason}，正在重启并恢复内容", "WARNING")
+        QTimer.singleShot(1000, self._restart)
+
+    def _restart(self):
+        if not self._closing:
+            self._start()
+
+    # 与ThreadedContentWindow一致的接口
+
+    def set_content(self, content_type, content):
+        self.content = (content_type, content)
+        self._send({'cmd': 'set_content', 'content_type': content_type, 'content': content})
+
+    def set_span_tile(self, canvas_size, tile_rect):
+        self.span_tile = (list(canvas_size), list(tile_rect)) if canvas_size and tile_rect else None
+        self._send({'cmd': 'span_tile', 'canvas': self.span_tile and self.span_tile[0],
+                    'tile': self.span_tile and self.span_tile[1]})
+
+    def apply_settings(self, settings):
+        self.settings = dict(settings)
+        self._send({'cmd': 'settings', 'settings': self.settings})
+
+    def show(self):
+        self.visible = True
+        self._send({'cmd': 'show'})
+
+    def hide(self):
+        self.visible = False
+        self._send({'cmd': 'hide'})
+
+    def close(self):
+        """关闭子进程窗口，超时后强制结束"""
+        self._closing = True
+        if self.process is None or self.process.state() == QProcess.NotRunning:
+            return
+        self._send({'cmd': 'close'})
+        if not self.process.waitForFinished(3000):
+            self.process.kill()
+            self.process.waitForFinished(1000)
+
+    def get_queue_stats(self):
+        """子进程内容命令队列统计（尚未上报时为空）"""
+        return self.child_stats.get('queue', {})
+
+    def get_swap_stats(self):
+        """子进程内容切换耗时统计"""
+        return self.child_stats.get('swap', {})
+
+    def get_image_cache_stats(self):
+        """子进程图片缓存统计"""
+        return self.child_stats.get('image_cache', {})
+
+    def get_stats(self):
+        """获取代理统计"""
+        return {
+            'renderer_pid': int(self.process.processId()) if self.process else 0,
+            'renderer_restarts': self.restarts,
+        }
+
+
+def run_renderer(server_name, screen_index):
+    """子进程入口：创建该屏幕的内容窗口并执行主进程下发的命令"""
+    app = QApplication(sys.argv)
+
+    from screen_manager import ScreenManager
+    from threaded_content_window import ThreadedContentWindow, OPENCV_AVAILABLE
+    from image_cache import image_cache
+
+    screens = ScreenManager().get_screens()
+    if not screens:
+        print("渲染进程: 没有可用的屏幕")
+        return 1
+    screen_info = screens[screen_index] if screen_index < len(screens) else screens[0]
+    window = ThreadedContentWindow(screen_index, screen_info)
+
+    socket = QLocalSocket()
+    socket.connectToServer(server_name)
+    if not socket.waitForConnected(5000):
+        print(f"渲染进程: 无法连接主进程 {server_name}")
+        return 1
+
+    buffer = [b""]
+
+    def handle(message):
+        cmd = message.get('cmd')
+        if cmd == 'settings':
+            settings = message['settings']
+            image_cache.configure(settings.get("image_cache", True), settings.get("image_cache_mb", 128))
+            window.apply_settings(settings)
+            if OPENCV_AVAILABLE:
+                from opencv_video_player import apply_playback_settings
+                apply_playback_settings(settings)
+        elif cmd == 'span_tile':
+            canvas, tile = message.get('canvas'), message.get('tile')
+            window.set_span_tile(tuple(canvas) if canvas else None, tuple(tile) if tile else None)
+        elif cmd == 'set_content':
+            window.set_content(message['content_type'], message['content'])
+        elif cmd == 'show':
+            window.show()
+        elif cmd == 'hide':
+            window.hide()
+        elif cmd == 'close':
+            window.window_closed.disconnect(on_window_closed)
+            window.close()
+            app.quit()
+
+    def on_ready_read():
+        buffer[0] += bytes(socket.readAll())
+        while b"\n" in buffer[0]:
+            line, buffer[0] = buffer[0].split(b"\n", 1)
+            try:
+                handle(json.loads(line.decode('utf-8')))
+            except Exception as e:
+                print(f"渲染进程命令处理失败: {e}")
+
+    def on_window_closed(_index):
+        socket.write(_encode({'event': 'closed'}))
+        socket.flush()
+        socket.waitForBytesWritten(1000)
+        app.quit()
+
+    def report_stats():
+        # 统计在子进程中产生，定期上报给主进程的状态日志
+        socket.write(_encode({
+            'event': 'stats',
+            'queue': window.get_queue_stats(),
+            'swap': window.get_swap_stats(),
+            'image_cache': image_cache.get_stats(),
+        }))
+
+    stats_timer = QTimer()
+    stats_timer.timeout.connect(report_stats)
+    stats_timer.start(STATS_INTERVAL_MS)
+
+    socket.readyRead.connect(on_ready_read)
+    # 主进程退出后子进程随之退出，不留孤儿窗口
+    socket.disconnected.connect(app.quit)
+    window.window_closed.connect(on_window_closed)
+    return app.exec_()
+
+
+__all__ = ['RendererProxy', 'run_renderer']
+
+
+if __name__ == "__main__":
+    sys.exit(run_renderer(sys.argv[1], int(sys.argv[2])))
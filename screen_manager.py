@@ -67,6 +67,24 @@ class ScreenManager:
                 return screen
         return None
         
+    def get_span_layout(self, screen_indices):
+        """计算多个屏幕拼接成的虚拟画布
+        返回 (画布尺寸(w, h), {屏幕索引: 画布内矩形(x, y, w, h)})，无有效屏幕时返回 (None, {})
+        """
+        geometries = {i: self.screens[i]['geometry'] for i in screen_indices if 0 <= i < len(self.screens)}
+        if not geometries:
+            return None, {}
+            
+        canvas = QRect()
+        for geometry in geometries.values():
+            canvas = canvas.united(geometry)
+            
+        tiles = {
+            i: (g.x() - canvas.x(), g.y() - canvas.y(), g.width(), g.height())
+            for i, g in geometries.items()
+        }
+        return (canvas.width(), canvas.height()), tiles
+        
     def print_screen_info(self):
         """打印所有屏幕信息（调试用）"""
         print(f"检测到 {len(self.screens)} 个屏幕:")
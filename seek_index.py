@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+视频关键帧索引
+首次打开视频时在后台用ffprobe读取关键帧位置（只解析封装，不解码），
+按 路径 + 大小 + 修改时间 持久化到cache目录；跳转时先定位到目标之前最近的关键帧，
+再逐帧向前解码到目标帧，长GOP文件上也能精确落点
+"""
+
+import os
+import json
+import bisect
+import hashlib
+import subprocess
+import threading
+
+from media_probe import media_probe
+
+SEEK_INDEX_DIR = os.path.join("cache", "seek_index")
+
+
+class SeekIndex:
+    """单个视频的关键帧帧号表"""
+
+    def __init__(self, keyframes):
+        self.keyframes = sorted(set(keyframes)) or [0]
+
+    def keyframe_before(self, frame_number):
+        """不晚于frame_number的最近关键帧"""
+        pos = bisect.bisect_right(self.keyframes, frame_number) - 1
+        return self.keyframes[max(0, pos)]
+
+    @property
+    def max_gop(self):
+        """最大关键帧间隔（帧）"""
+        gaps = [b - a for a, b in zip(self.keyframes, self.keyframes[1:])]
+        return max(gaps, default=0)
+
+
+class SeekIndexStore:
+    """关键帧索引缓存：内存 + 磁盘，后台构建"""
+
+    def __init__(self, directory=SEEK_INDEX_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._indexes = {}     # 缓存键 -> SeekIndex
+        self._building = set()
+        self._failed = set()   # 构建失败的缓存键，本次运行不再重试
+        self.ffprobe_available = True
+
+    def _make_key(self, video_path):
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        return (os.path.normcase(os.path.abspath(video_path)), stat.st_size, stat.st_mtime)
+
+    def _cache_file(self, key):
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, video_path, fps):
+        """返回已有的索引；没有时在后台开始构建并返回None"""
+        key = self._make_key(video_path)
+        if key is None:
+            return None
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None or key in self._building or key in self._failed:
+                return index
+            self._building.add(key)
+        threading.Thread(target=self._load_or_build, args=(key, video_path, fps), daemon=True).start()
+        return None
+
+    def _load_or_build(self, key, video_path, fps):
+        try:
+            path = self._cache_file(key)
+            keyframes = None
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        keyframes = json.load(f)['keyframes']
+                except Exception as e:
+                    print(f"加载关键帧索引失败: {e}")
+            if keyframes is None:
+                keyframes = self._probe_keyframes(video_path, fps)
+                if keyframes is None:
+                    with self._lock:
+                        self._failed.add(key)
+                    return
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        json.dump({'source': key[0], 'fps': fps, 'keyframes': keyframes}, f)
+                except Exception as e:
+                    print(f"保存关键帧索引失败: {e}")
+            index = SeekIndex(keyframes)
+            with self._lock:
+                self._indexes[key] = index
+            media_probe.update(video_path, keyframes=len(index.keyframes), max_gop=index.max_gop)
+            print(f"关键帧索引就绪: {os.path.basename(video_path)}，{len(index.keyframes)}个关键帧，最大间隔{index.max_gop}帧")
+        finally:
+            with self._lock:
+                self._building.discard(key)
+
+    def _probe_keyframes(self, video_path, fps):
+        """用ffprobe读取视频流的关键帧时间戳并换算为帧号"""
+        if not self.ffprobe_available:
+            return None
+        cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+               '-show_entries', 'stream=start_time:packet=pts_time,flags', '-of', 'json', video_path]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        except FileNotFoundError:
+            # 未安装ffprobe，本次运行不再尝试，跳转回退到OpenCV自带定位
+            self.ffprobe_available = False
+            print("未找到ffprobe，跳转不使用关键帧索引")
+            return None
+        except Exception as e:
+            print(f"构建关键帧索引失败: {e}")
+            return None
+        if result.returncode != 0:
+            print(f"构建关键帧索引失败: {result.stderr.strip()}")
+            return None
+
+        data = json.loads(result.stdout)
+        streams = data.get('streams') or [{}]
+        start = float(streams[0].get('start_time') or 0)
+        keyframes = []
+        for packet in data.get('packets', []):
+            pts = packet.get('pts_time')
+            if 'K' in packet.get('flags', '') and pts not in (None, 'N/A'):
+                keyframes.append(max(0, int(round((float(pts) - start) * fps))))
+        return keyframes
+
+
+# 进程内共享的关键帧索引
+seek_indexes = SeekIndexStore()
+
+
+__all__ = ['SeekIndex', 'SeekIndexStore', 'seek_indexes']
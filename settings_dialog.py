@@ -365,8 +365,73 @@ class SettingsDialog(QDialog):
         self.memory_optimization_cb.setToolTip("定期清理未使用的内存资源")
         performance_layout.addWidget(self.memory_optimization_cb)
         
+        # 短视频解码帧缓存
+        self.clip_cache_cb = QCheckBox("缓存循环播放的短视频")
+        self.clip_cache_cb.setToolTip("15秒以内的视频解码一遍后缓存画面，之后的循环和其他屏幕不再解码")
+        performance_layout.addWidget(self.clip_cache_cb)
+        
+        clip_cache_layout = QHBoxLayout()
+        clip_cache_layout.addWidget(QLabel("缓存上限:"))
+        self.clip_cache_mb = QSpinBox()
+        self.clip_cache_mb.setRange(64, 8192)
+        self.clip_cache_mb.setSingleStep(64)
+        self.clip_cache_mb.setSuffix(" MB")
+        clip_cache_layout.addWidget(self.clip_cache_mb)
+        clip_cache_layout.addWidget(QLabel("存储位置:"))
+        self.clip_cache_storage = QComboBox()
+        self.clip_cache_storage.addItems(["内存", "磁盘映射"])
+        self.clip_cache_storage.setToolTip("磁盘映射将画面写入cache目录下的文件，由系统按需换入内存")
+        clip_cache_layout.addWidget(self.clip_cache_storage)
+        clip_cache_layout.addStretch()
+        performance_layout.addLayout(clip_cache_layout)
+        
+        # 解码图片缓存
+        image_cache_layout = QHBoxLayout()
+        self.image_cache_cb = QCheckBox("缓存已解码图片，上限:")
+        self.image_cache_cb.setToolTip("切换到使用相同图片的配置时不再读取和缩放图片文件")
+        image_cache_layout.addWidget(self.image_cache_cb)
+        self.image_cache_mb = QSpinBox()
+        self.image_cache_mb.setRange(16, 2048)
+        self.image_cache_mb.setSingleStep(16)
+        self.image_cache_mb.setSuffix(" MB")
+        image_cache_layout.addWidget(self.image_cache_mb)
+        image_cache_layout.addStretch()
+        performance_layout.addLayout(image_cache_layout)
+        
+        # 视频预渲染
+        self.prerender_videos_cb = QCheckBox("预渲染视频（首次播放后在后台生成，占用较多磁盘空间）")
+        self.prerender_videos_cb.setToolTip("把视频转换为屏幕分辨率的原始画面文件，之后播放不再解码，适合CPU解码吃力的视频")
+        performance_layout.addWidget(self.prerender_videos_cb)
+        
+        # 多进程解码
+        self.process_decode_cb = QCheckBox("在独立进程中解码视频")
+        self.process_decode_cb.setToolTip("每个视频在单独的进程中解码，多屏播放时充分利用多核CPU；对新打开的视频生效")
+        performance_layout.addWidget(self.process_decode_cb)
+        
+        # 屏幕进程隔离
+        self.renderer_processes_cb = QCheckBox("每个屏幕使用独立渲染进程")
+        self.renderer_processes_cb.setToolTip("单个屏幕的网页或视频崩溃不影响其他屏幕，崩溃后自动重启并恢复内容；对新建的屏幕窗口生效")
+        performance_layout.addWidget(self.renderer_processes_cb)
+        
         layout.addWidget(performance_group)
         
+        # 视频同步设置组
+        sync_group = QGroupBox("🎬 视频同步")
+        sync_layout = QVBoxLayout(sync_group)
+        sync_layout.setSpacing(15)
+        
+        # 同步启动
+        self.sync_video_start_cb = QCheckBox("应用配置时多屏视频同步启动")
+        self.sync_video_start_cb.setToolTip("所有屏幕的视频首帧就绪后再一起开始播放")
+        sync_layout.addWidget(self.sync_video_start_cb)
+        
+        # 循环点对齐
+        self.align_video_loops_cb = QCheckBox("循环点对齐")
+        self.align_video_loops_cb.setToolTip("较短的视频播放结束后等待最长的视频，所有屏幕一起重新开始")
+        sync_layout.addWidget(self.align_video_loops_cb)
+        
+        layout.addWidget(sync_group)
+        
         # 存储设置组
         storage_group = QGroupBox("💾 存储设置")
         storage_layout = QGridLayout(storage_group)
@@ -441,6 +506,19 @@ class SettingsDialog(QDialog):
         speed_layout.addStretch()
         animation_layout.addLayout(speed_layout)
         
+        # 屏幕内容切换淡入淡出
+        crossfade_layout = QHBoxLayout()
+        crossfade_layout.addWidget(QLabel("屏幕内容切换淡入淡出:"))
+        self.content_crossfade_ms = QSpinBox()
+        self.content_crossfade_ms.setRange(0, 2000)
+        self.content_crossfade_ms.setSingleStep(100)
+        self.content_crossfade_ms.setSuffix(" ms")
+        self.content_crossfade_ms.setSpecialValueText("关闭")
+        self.content_crossfade_ms.setToolTip("新内容准备就绪后从旧画面渐变过渡，0为直接切换")
+        crossfade_layout.addWidget(self.content_crossfade_ms)
+        crossfade_layout.addStretch()
+        animation_layout.addLayout(crossfade_layout)
+        
         layout.addWidget(animation_group)
         
         # 窗口设置组
@@ -543,12 +621,23 @@ class SettingsDialog(QDialog):
             "auto_load_config": True,
             "hardware_acceleration": True,
             "memory_optimization": True,
+            "clip_cache": False,
+            "clip_cache_mb": 512,
+            "clip_cache_storage": "内存",
+            "image_cache": True,
+            "image_cache_mb": 128,
+            "prerender_videos": False,
+            "process_decode": False,
+            "renderer_processes": False,
+            "sync_video_start": True,
+            "align_video_loops": False,
             "max_configs": 50,
             "auto_backup": True,
             "theme": "深色主题",
             "opacity": 100,
             "enable_animations": True,
             "animation_speed": "正常",
+            "content_crossfade_ms": 0,
             "remember_position": True,
             "always_on_top": False
         }
@@ -587,6 +676,16 @@ class SettingsDialog(QDialog):
         self.auto_load_config_cb.setChecked(self.settings["auto_load_config"])
         self.hardware_acceleration_cb.setChecked(self.settings["hardware_acceleration"])
         self.memory_optimization_cb.setChecked(self.settings["memory_optimization"])
+        self.clip_cache_cb.setChecked(self.settings["clip_cache"])
+        self.clip_cache_mb.setValue(self.settings["clip_cache_mb"])
+        self.clip_cache_storage.setCurrentText(self.settings["clip_cache_storage"])
+        self.image_cache_cb.setChecked(self.settings["image_cache"])
+        self.image_cache_mb.setValue(self.settings["image_cache_mb"])
+        self.prerender_videos_cb.setChecked(self.settings["prerender_videos"])
+        self.process_decode_cb.setChecked(self.settings["process_decode"])
+        self.renderer_processes_cb.setChecked(self.settings["renderer_processes"])
+        self.sync_video_start_cb.setChecked(self.settings["sync_video_start"])
+        self.align_video_loops_cb.setChecked(self.settings["align_video_loops"])
         self.max_configs.setValue(self.settings["max_configs"])
         self.auto_backup_cb.setChecked(self.settings["auto_backup"])
         
@@ -596,6 +695,7 @@ class SettingsDialog(QDialog):
         self.update_opacity_label(self.settings["opacity"])
         self.enable_animations_cb.setChecked(self.settings["enable_animations"])
         self.animation_speed.setCurrentText(self.settings["animation_speed"])
+        self.content_crossfade_ms.setValue(self.settings["content_crossfade_ms"])
         self.remember_position_cb.setChecked(self.settings["remember_position"])
         self.always_on_top_cb.setChecked(self.settings["always_on_top"])
         
@@ -614,12 +714,23 @@ class SettingsDialog(QDialog):
             "auto_load_config": self.auto_load_config_cb.isChecked(),
             "hardware_acceleration": self.hardware_acceleration_cb.isChecked(),
             "memory_optimization": self.memory_optimization_cb.isChecked(),
+            "clip_cache": self.clip_cache_cb.isChecked(),
+            "clip_cache_mb": self.clip_cache_mb.value(),
+            "clip_cache_storage": self.clip_cache_storage.currentText(),
+            "image_cache": self.image_cache_cb.isChecked(),
+            "image_cache_mb": self.image_cache_mb.value(),
+            "prerender_videos": self.prerender_videos_cb.isChecked(),
+            "process_decode": self.process_decode_cb.isChecked(),
+            "renderer_processes": self.renderer_processes_cb.isChecked(),
+            "sync_video_start": self.sync_video_start_cb.isChecked(),
+            "align_video_loops": self.align_video_loops_cb.isChecked(),
             "max_configs": self.max_configs.value(),
             "auto_backup": self.auto_backup_cb.isChecked(),
             "theme": self.theme_combo.currentText(),
             "opacity": self.opacity_slider.value(),
             "enable_animations": self.enable_animations_cb.isChecked(),
             "animation_speed": self.animation_speed.currentText(),
+            "content_crossfade_ms": self.content_crossfade_ms.value(),
             "remember_position": self.remember_position_cb.isChecked(),
             "always_on_top": self.always_on_top_cb.isChecked()
         })
@@ -644,6 +755,16 @@ class SettingsDialog(QDialog):
             self.auto_load_config_cb.setChecked(True)
             self.hardware_acceleration_cb.setChecked(True)
             self.memory_optimization_cb.setChecked(True)
+            self.clip_cache_cb.setChecked(False)
+            self.clip_cache_mb.setValue(512)
+            self.clip_cache_storage.setCurrentText("内存")
+            self.image_cache_cb.setChecked(True)
+            self.image_cache_mb.setValue(128)
+            self.prerender_videos_cb.setChecked(False)
+            self.process_decode_cb.setChecked(False)
+            self.renderer_processes_cb.setChecked(False)
+            self.sync_video_start_cb.setChecked(True)
+            self.align_video_loops_cb.setChecked(False)
             self.max_configs.setValue(50)
             self.auto_backup_cb.setChecked(True)
             
@@ -651,6 +772,7 @@ class SettingsDialog(QDialog):
             self.opacity_slider.setValue(100)
             self.enable_animations_cb.setChecked(True)
             self.animation_speed.setCurrentText("正常")
+            self.content_crossfade_ms.setValue(0)
             self.remember_position_cb.setChecked(True)
             self.always_on_top_cb.setChecked(False)
             
@@ -166,4 +166,11 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # 解码子进程在打包后的程序中也从入口文件启动
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 3 and sys.argv[1] == "--renderer":
+        # 进程隔离模式下的屏幕渲染子进程
+        from renderer_process import run_renderer
+        sys.exit(run_renderer(sys.argv[2], int(sys.argv[3])))
     main()
\ No newline at end of file
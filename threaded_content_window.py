@@ -8,19 +8,21 @@
 import os
 import sys
 import json
+import time
 from threading import Thread, Event
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QApplication
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QThread
-from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QApplication, QStackedWidget
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject, QThread, QSize, QVariantAnimation
+from PyQt5.QtGui import QPainter
 from PyQt5.QtCore import QUrl
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
+from content_presenters import PresenterPool, MESSAGE_TYPE
+from command_queue import CoalescingCommandQueue
 
-# 尝试导入OpenCV播放器
+# 尝试导入OpenCV播放器（播放器实例由视频展示器创建，这里只检测是否可用）
 try:
     import cv2
-    from opencv_video_player import OpenCVVideoPlayer
+    import opencv_video_player
     OPENCV_AVAILABLE = True
     print("OpenCV播放器导入成功")
 except ImportError as e:
@@ -49,6 +51,48 @@ print(f"运行环境: {sys.executable}")
 print(f"是否为EXE: {'是' if hasattr(sys, 'frozen') else '否'}")
 
 
+class CrossfadeOverlay(QWidget):
+    """切换内容时覆盖在新内容上的旧画面快照，不透明度降到0后隐藏"""
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.pixmap = None
+        self.opacity = 0.0
+        self.animation = QVariantAnimation(self)
+        self.animation.setStartValue(1.0)
+        self.animation.setEndValue(0.0)
+        self.animation.valueChanged.connect(self._set_opacity)
+        self.animation.finished.connect(self._finish)
+        self.hide()
+        
+    def start(self, pixmap, geometry, duration_ms):
+        self.animation.stop()
+        self.pixmap = pixmap
+        self.opacity = 1.0
+        self.setGeometry(geometry)
+        self.raise_()
+        self.show()
+        self.animation.setDuration(duration_ms)
+        self.animation.start()
+        
+    def _set_opacity(self, value):
+        self.opacity = value
+        self.update()
+        
+    def _finish(self):
+        self.hide()
+        self.pixmap = None
+        
+    def paintEvent(self, event):
+        if self.pixmap is None:
+            return
+        painter = QPainter(self)
+        painter.setOpacity(self.opacity)
+        painter.drawPixmap(self.rect(), self.pixmap)
+        painter.end()
+
+
 class ThreadedContentWindow(QWidget):
     """基于线程的内容窗口 - 优化的无边框设计"""
     
@@ -71,8 +115,28 @@ class ThreadedContentWindow(QWidget):
         # 窗口状态
         self.is_fullscreen = True  # 默认全屏
         
-        # 线程同步
-        self.content_loading = False
+        # 拼接视频分块 (画布尺寸, 本屏在画布内的矩形)，由主控制器按屏幕布局设置
+        self.span_tile = None
+        
+        # 内容命令队列：连续的设置请求合并为最后一次，上一条完成（切换或失败）后再执行
+        self.command_queue = CoalescingCommandQueue(self._run_command, f"屏幕 {screen_index + 1}")
+        # 回退加载流程的延迟步骤：按内容代次丢弃过期步骤，全部步骤执行完才结束当前命令
+        self._content_generation = 0
+        self._deferred_steps = 0
+        
+        # 在后台缓冲中准备的展示器，内容就绪后替换当前内容
+        self.preroll_presenter = None
+        self.preroll_timeout_ms = 5000
+        self._preroll_started = 0.0
+        self._preroll_generation = 0
+        
+        # 当前显示的展示器，以及不在池中的临时控件（回退播放器）
+        self.current_presenter = None
+        self.transient_widgets = []
+        
+        # 切换效果与统计：淡入淡出时长（0为直接切换），各内容类型的切换耗时
+        self.crossfade_ms = 0
+        self.swap_stats = {}
         
         self.init_ui()
         
@@ -97,6 +161,12 @@ class ThreadedContentWindow(QWidget):
         self.content_layout.setContentsMargins(0, 0, 0, 0)
         self.content_layout.setSpacing(0)
         
+        # 各类型展示器常驻于stack中，切换内容只更新数据
+        self.content_stack = QStackedWidget()
+        self.content_layout.addWidget(self.content_stack)
+        self.presenters = PresenterPool(self.content_stack)
+        self.crossfade_overlay = CrossfadeOverlay(self)
+        
         # 优化初始化：只设置位置，不立即显示内容
         self.position_window()
         
@@ -116,57 +186,68 @@ class ThreadedContentWindow(QWidget):
         
     def show_default_content(self):
         """显示默认内容"""
+        if self.current_content_type is not None:
+            return  # 内容已先于默认提示到达
         self.clear_content()
-        
-        default_widget = QWidget()
-        default_layout = QVBoxLayout(default_widget)
-        default_layout.setAlignment(Qt.AlignCenter)
-        
-        # 简洁等待提示
-        wait_label = QLabel("等待内容...")
-        wait_label.setAlignment(Qt.AlignCenter)
-        wait_label.setFont(QFont("Microsoft YaHei", 20))
-        wait_label.setStyleSheet("""
-            QLabel {
-                color: #666666;
-                background: transparent;
-                border: none;
-            }
-        """)
-        default_layout.addWidget(wait_label)
-        
-        self.content_layout.addWidget(default_widget)
+        self._show_message("等待内容...")
         
     def _show_loading_indicator(self):
         """显示加载指示器"""
-        loading_widget = QWidget()
-        loading_layout = QVBoxLayout(loading_widget)
-        loading_layout.setAlignment(Qt.AlignCenter)
-        
-        loading_label = QLabel("⏳ 正在加载...")
-        loading_label.setAlignment(Qt.AlignCenter)
-        loading_label.setFont(QFont("Microsoft YaHei", 18))
-        loading_label.setStyleSheet("""
-            QLabel {
-                color: #00ffff;
-                background: transparent;
-                border: none;
-            }
-        """)
-        loading_layout.addWidget(loading_label)
-        
-        self.content_layout.addWidget(loading_widget)
+        self._show_message("⏳ 正在加载...", "loading")
+        
+    def _show_message(self, text, kind="default"):
+        """用提示展示器显示文字"""
+        presenter = self._acquire_presenter(MESSAGE_TYPE)
+        presenter.present(text, kind)
+        self._show_presenter(presenter)
+        
+    def _acquire_presenter(self, content_type):
+        """从展示器池借出展示器，新建时连接其信号"""
+        presenter, created = self.presenters.acquire(content_type)
+        if created:
+            presenter.ready.connect(lambda: self._commit_preroll(presenter))
+            presenter.failed.connect(lambda message: self._on_presenter_failed(presenter, message))
+        return presenter
+        
+    def _show_presenter(self, presenter):
+        """切换到指定展示器，之前的展示器归还到池中"""
+        previous = self.current_presenter
+        self.current_presenter = presenter
+        self.content_stack.setCurrentWidget(presenter)
+        if previous is not None and previous is not presenter:
+            self.presenters.release(previous)
+            
+    def _add_transient_widget(self, widget):
+        """回退播放器等不在池中的控件：临时加入stack，清空内容时销毁"""
+        self.transient_widgets.append(widget)
+        self.content_stack.addWidget(widget)
+        self.content_stack.setCurrentWidget(widget)
         
     def set_content(self, content_type, content):
-        """设置内容 - 使用线程优化"""
-        if self.content_loading:
-            return  # 避免重复加载
+        """设置内容 - 进入命令队列，正在切换时到达的请求排队并合并，不会丢失最终内容"""
+        self.command_queue.submit("content", (content_type, content))
+        
+    def _run_command(self, key, payload):
+        """执行队列中的命令，内容切换完成后调用command_queue.complete()"""
+        if key == "content":
+            self._apply_content(*payload)
+        else:
+            self.command_queue.complete()
             
+    def _apply_content(self, content_type, content):
+        """应用内容"""
+        self._content_generation += 1
+        self._deferred_steps = 0
         self.current_content_type = content_type
         self.current_content = content
         
         print(f"为屏幕 {self.screen_index + 1} 设置内容: {content_type}")
         
+        # 在后台缓冲中准备新内容，当前画面保持到新内容就绪后一次切换
+        if self.preroll(content_type, content):
+            return
+            
+        # 没有对应展示器的内容（回退播放器、文件缺失等）按原流程加载
         # 立即清除所有内容，包括默认的"等待内容..."
         self.clear_content()
         
@@ -174,15 +255,28 @@ class ThreadedContentWindow(QWidget):
         self._show_loading_indicator()
         
         # 延迟加载新内容，确保界面更新完成
-        QTimer.singleShot(100, lambda: self._load_content_safe(content_type, content))
+        self._defer(100, lambda: self._load_content_safe(content_type, content))
+        
+    def _defer(self, delay_ms, callback):
+        """延迟执行回退流程的加载步骤：执行前已有新内容时丢弃，
+        当前命令在所有步骤（含步骤中再次延迟的步骤）执行完后才完成"""
+        generation = self._content_generation
+        self._deferred_steps += 1
+        
+        def run():
+            if generation != self._content_generation:
+                return  # 已被新的内容命令取代
+            try:
+                callback()
+            finally:
+                self._deferred_steps -= 1
+                if self._deferred_steps == 0:
+                    self.command_queue.complete()
+                    
+        QTimer.singleShot(delay_ms, run)
         
     def _load_content_safe(self, content_type, content):
         """安全的内容加载"""
-        if self.content_loading:
-            return
-            
-        self.content_loading = True
-        
         try:
             # 再次清除内容，确保加载指示器被移除
             self.clear_content()
@@ -194,6 +288,8 @@ class ThreadedContentWindow(QWidget):
                 self.set_image_content(content)
             elif content_type == "视频":
                 self.set_video_content(content)
+            elif content_type == "拼接视频":
+                self.set_span_video_content(content)
             elif content_type == "网页":
                 self.set_web_content(content)
             else:
@@ -201,61 +297,31 @@ class ThreadedContentWindow(QWidget):
                 
         except Exception as e:
             self.show_error(f"内容加载失败: {str(e)}")
-        finally:
-            self.content_loading = False
             
     def set_text_content(self, text):
         """设置文本内容"""
-        text_widget = QWidget()
-        text_layout = QVBoxLayout(text_widget)
-        text_layout.setAlignment(Qt.AlignCenter)
-        
-        text_label = QLabel(text)
-        text_label.setAlignment(Qt.AlignCenter)
-        text_label.setFont(QFont("Microsoft YaHei", 24, QFont.Bold))
-        text_label.setStyleSheet("""
-            QLabel {
-                color: #ffffff;
-                background: transparent;
-                border: none;
-            }
-        """)
-        text_label.setWordWrap(True)
-        text_layout.addWidget(text_label)
-        
-        self.content_layout.addWidget(text_widget)
+        presenter = self._acquire_presenter("文本")
+        presenter.present(text)
+        self._show_presenter(presenter)
         
     def set_image_content(self, image_path):
-        """设置图片内容"""
+        """设置图片内容 - 在后台线程按屏幕尺寸解码，界面线程只负责绘制"""
         if os.path.exists(image_path):
-            try:
-                image_widget = QWidget()
-                image_layout = QVBoxLayout(image_widget)
-                image_layout.setAlignment(Qt.AlignCenter)
-                
-                image_label = QLabel()
-                pixmap = QPixmap(image_path)
-                
-                if not pixmap.isNull():
-                    # 缩放图片以适应屏幕
-                    scaled_pixmap = pixmap.scaled(
-                        self.width() - 40,
-                        self.height() - 40,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    image_label.setPixmap(scaled_pixmap)
-                    image_label.setAlignment(Qt.AlignCenter)
-                    image_layout.addWidget(image_label)
-                    
-                    self.content_layout.addWidget(image_widget)
-                else:
-                    self.show_error("图片格式不支持")
-            except Exception as e:
-                self.show_error(f"图片加载失败: {str(e)}")
+            presenter = self._acquire_presenter("图片")
+            # 缩放图片以适应屏幕（四周留20像素）
+            presenter.present(image_path, QSize(self.width() - 40, self.height() - 40))
+            self._show_presenter(presenter)
         else:
             self.show_error("图片文件未找到")
             
+    def _on_presenter_failed(self, presenter, message):
+        """展示器准备失败：视频切换后由播放器显示错误，图片改为显示错误信息"""
+        if presenter is self.preroll_presenter and presenter.content_type == "视频":
+            self._commit_preroll(presenter)
+        elif presenter is self.preroll_presenter or presenter is self.current_presenter:
+            self.clear_content()
+            self.show_error(f"{presenter.content_type}加载失败: {message}")
+            
     def set_video_content(self, video_path):
         """设置视频内容 - 线程优化版本"""
         if not os.path.exists(video_path):
@@ -271,16 +337,17 @@ class ThreadedContentWindow(QWidget):
                     # 优先使用OpenCV播放器（性能最佳）
                     if OPENCV_AVAILABLE:
                         print(f"屏幕 {self.screen_index + 1}: 使用OpenCV播放器")
-                        QTimer.singleShot(100, lambda: self._setup_opencv_player(video_path))
+                        self._defer(100, lambda: self._setup_opencv_player(video_path))
                     elif EMBEDDED_AVAILABLE:
                         print(f"屏幕 {self.screen_index + 1}: 使用嵌入式播放器")
-                        QTimer.singleShot(100, lambda: self._setup_embedded_player(video_path))
+                        self._defer(100, lambda: self._setup_embedded_player(video_path))
                     else:
                         print(f"屏幕 {self.screen_index + 1}: 使用Qt默认播放器")
-                        QTimer.singleShot(100, lambda: self._setup_qt_video_player(video_path))
+                        self._defer(100, lambda: self._setup_qt_video_player(video_path))
                 except Exception as e:
                     print(f"视频设置错误: {e}")
-                    QTimer.singleShot(100, lambda: self.show_error(f"视频设置失败: {str(e)}"))
+                    message = f"视频设置失败: {str(e)}"
+                    self._defer(100, lambda: self.show_error(message))
                     
             # 在主线程中启动
             load_video()
@@ -288,17 +355,140 @@ class ThreadedContentWindow(QWidget):
         except Exception as e:
             self.show_error(f"视频播放器初始化失败: {str(e)}")
             
+    def set_span_video_content(self, video_path):
+        """设置拼接视频内容 - 多屏共用一路解码，各自裁剪本屏分块"""
+        if not os.path.exists(video_path):
+            self.show_error(f"视频文件未找到: {video_path}")
+            return
+        if not OPENCV_AVAILABLE:
+            self.show_error("拼接视频需要OpenCV播放器")
+            return
+            
+        print(f"为屏幕 {self.screen_index + 1} 加载拼接视频: {video_path}, 分块: {self.span_tile}")
+        self._defer(100, lambda: self._setup_opencv_player(video_path))
+        
+    def set_span_tile(self, canvas_size, tile_rect):
+        """更新拼接分块，播放中立即生效"""
+        self.span_tile = (canvas_size, tile_rect) if canvas_size and tile_rect else None
+        if self.current_content_type == "拼接视频":
+            for presenter in (self.current_presenter, self.preroll_presenter):
+                if presenter is not None and presenter.content_type == "视频":
+                    presenter.player.set_span_tile(canvas_size, tile_rect)
+                    
+    def _video_span_tile(self):
+        """当前内容的拼接分块，非拼接视频为None"""
+        return self.span_tile if self.current_content_type == "拼接视频" else None
+        
+    def _presenter_request(self, content_type, content):
+        """内容对应的 (展示器类型, present参数)；无法由展示器准备时返回None"""
+        if content_type == "文本":
+            return "文本", (content,)
+        if content_type == "图片" and os.path.exists(content):
+            # 缩放图片以适应屏幕（四周留20像素）
+            return "图片", (content, QSize(self.width() - 40, self.height() - 40))
+        if content_type in ("视频", "拼接视频") and OPENCV_AVAILABLE and os.path.exists(content):
+            if content_type == "拼接视频" and not self.span_tile:
+                return None
+            return "视频", (content, self._video_span_tile(), self.size())
+        if content_type == "网页":
+            return "网页", (content,)
+        return None
+        
+    def preroll(self, content_type, content):
+        """预卷内容：当前内容继续显示，新内容在后台缓冲（stack中未显示的展示器）里准备，
+        视频解码出首帧、图片解码完成、网页加载完成后一次性切换；返回False表示该内容不走预卷"""
+        request = self._presenter_request(content_type, content)
+        if request is None:
+            return False
+            
+        presenter_type, arguments = request
+        # 借出的是当前未显示的展示器，与前台内容互为双缓冲
+        presenter = self._acquire_presenter(presenter_type)
+        self.preroll_presenter = presenter
+        self._preroll_generation += 1
+        self._preroll_started = time.perf_counter()
+        # 同步就绪的内容（文本、已缓存的图片）在present()内即完成切换
+        presenter.present(*arguments)
+        if self.preroll_presenter is presenter:
+            # 超时仍未就绪时直接切换，避免长时间停留在旧内容
+            generation = self._preroll_generation
+            QTimer.singleShot(self.preroll_timeout_ms, lambda: self._on_preroll_timeout(generation))
+        return True
+        
+    def _on_preroll_timeout(self, generation):
+        if generation == self._preroll_generation and self.preroll_presenter is not None:
+            # 正常情况下本地文件远早于超时就绪，走到这里说明预卷信号未送达或解码严重受阻
+            content_type = self.current_content_type or self.preroll_presenter.content_type
+            stats = self.swap_stats.setdefault(content_type, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['timeouts'] = stats.get('timeouts', 0) + 1
+            print(f"⚠️ 屏幕 {self.screen_index + 1}: {content_type}预卷 {self.preroll_timeout_ms}ms 内未就绪，强制切换")
+            self._commit_preroll(self.preroll_presenter)
+            
+    def _commit_preroll(self, presenter):
+        """后台缓冲就绪：在同一次绘制中换下旧内容，可选淡入淡出"""
+        if presenter is not self.preroll_presenter:
+            return  # 已切换或已被新的内容取代
+        self.preroll_presenter = None
+        elapsed = (time.perf_counter() - self._preroll_started) * 1000
+        
+        snapshot = None
+        if self.crossfade_ms > 0 and self.isVisible() and self.content_stack.currentWidget() is not None:
+            # 旧画面快照必须在旧展示器归还（清空）之前截取
+            snapshot = self.content_stack.currentWidget().grab()
+        self.clear_content()
+        self._show_presenter(presenter)
+        if presenter.content_type == "视频":
+            self.opencv_player = presenter.player
+        elif presenter.content_type == "网页":
+            self.web_view = presenter
+        if snapshot is not None:
+            self.crossfade_overlay.start(snapshot, self.content_stack.geometry(), self.crossfade_ms)
+            
+        self._record_swap(self.current_content_type or presenter.content_type, elapsed)
+        self.command_queue.complete()
+        
+    def _record_swap(self, content_type, elapsed_ms):
+        """记录各内容类型从请求到切换的耗时"""
+        stats = self.swap_stats.setdefault(content_type, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        print(f"屏幕 {self.screen_index + 1}: {content_type}内容就绪，{elapsed_ms:.0f}ms 后切换")
+        
+    def get_queue_stats(self):
+        """获取内容命令队列统计"""
+        return self.command_queue.get_stats()
+        
+    def get_swap_stats(self):
+        """获取切换耗时统计: 内容类型 -> {次数, 平均, 最大(ms), 预卷超时次数}"""
+        return {
+            content_type: {
+                'count': stats['count'],
+                'avg_ms': round(stats['total_ms'] / stats['count'], 1),
+                'max_ms': round(stats['max_ms'], 1),
+                'timeouts': stats.get('timeouts', 0),
+            }
+            for content_type, stats in self.swap_stats.items()
+        }
+        
+    def apply_settings(self, settings):
+        """应用与内容窗口相关的设置"""
+        self.crossfade_ms = int(settings.get("content_crossfade_ms", 0))
+        
+    def _cancel_preroll(self):
+        """放弃尚未切换的预卷，对应的内容命令随之结束"""
+        if self.preroll_presenter is not None:
+            presenter, self.preroll_presenter = self.preroll_presenter, None
+            self.presenters.release(presenter)
+            self.command_queue.complete()
+            
     def _setup_opencv_player(self, video_path):
-        """设置OpenCV播放器"""
+        """设置OpenCV播放器（复用视频展示器，立即显示）"""
         try:
-            print(f"尝试创建OpenCV播放器实例...")
-            self.opencv_player = OpenCVVideoPlayer()
-            print(f"OpenCV播放器实例创建成功")
-            self.content_layout.addWidget(self.opencv_player)
-            print(f"OpenCV播放器添加到布局")
-            
-            # 延迟启动播放
-            QTimer.singleShot(300, lambda: self._start_opencv_playback(video_path))
+            presenter = self._acquire_presenter("视频")
+            self._show_presenter(presenter)
+            self.opencv_player = presenter.player
+            presenter.present(video_path, self._video_span_tile(), self.size())
         except Exception as e:
             print(f"OpenCV播放器设置失败: {e}")
             import traceback
@@ -306,20 +496,11 @@ class ThreadedContentWindow(QWidget):
             print(f"回退到Qt播放器")
             self._setup_qt_video_player(video_path)
             
-    def _start_opencv_playback(self, video_path):
-        """启动OpenCV播放"""
-        if hasattr(self, 'opencv_player') and self.opencv_player:
-            success = self.opencv_player.play_video(video_path)
-            if not success:
-                print("OpenCV播放失败，尝试Qt播放器")
-                self.clear_content()
-                self._setup_qt_video_player(video_path)
-                
     def _setup_embedded_player(self, video_path):
         """设置嵌入式播放器"""
         try:
             self.embedded_player = EmbeddedVideoPlayer()
-            self.content_layout.addWidget(self.embedded_player)
+            self._add_transient_widget(self.embedded_player)
             
             QTimer.singleShot(300, lambda: self._start_embedded_playback(video_path))
         except Exception as e:
@@ -349,7 +530,7 @@ class ThreadedContentWindow(QWidget):
             media_content = QMediaContent(QUrl.fromLocalFile(os.path.abspath(video_path)))
             self.media_player.setMedia(media_content)
             
-            self.content_layout.addWidget(self.video_widget)
+            self._add_transient_widget(self.video_widget)
             
             # 延迟开始播放
             QTimer.singleShot(500, self._start_qt_playback)
@@ -380,39 +561,21 @@ class ThreadedContentWindow(QWidget):
     def set_web_content(self, url):
         """设置网页内容"""
         try:
-            self.web_view = QWebEngineView()
-            if url.startswith(('http://', 'https://')):
-                self.web_view.load(QUrl(url))
-            else:
-                self.web_view.load(QUrl('https://' + url))
-                
-            self.content_layout.addWidget(self.web_view)
-            
+            presenter = self._acquire_presenter("网页")
+            presenter.present(url)
+            self._show_presenter(presenter)
+            self.web_view = presenter
         except Exception as e:
             self.show_error(f"网页加载失败: {str(e)}")
             
     def show_error(self, message):
         """显示错误信息"""
-        error_widget = QWidget()
-        error_layout = QVBoxLayout(error_widget)
-        error_layout.setAlignment(Qt.AlignCenter)
-        
-        error_label = QLabel(f"⚠️ {message}")
-        error_label.setAlignment(Qt.AlignCenter)
-        error_label.setFont(QFont("Microsoft YaHei", 16, QFont.Bold))
-        error_label.setStyleSheet("""
-            QLabel {
-                color: #ff6666;
-                background: transparent;
-                border: none;
-            }
-        """)
-        error_layout.addWidget(error_label)
-        
-        self.content_layout.addWidget(error_widget)
+        self._show_message(f"⚠️ {message}", "error")
         
     def clear_content(self):
-        """清空内容"""
+        """清空内容：池中的展示器归还复用，临时控件销毁"""
+        self._cancel_preroll()
+        
         # 清理媒体播放器
         if hasattr(self, 'media_player') and self.media_player:
             self.media_player.stop()
@@ -421,25 +584,25 @@ class ThreadedContentWindow(QWidget):
         if hasattr(self, 'video_widget') and self.video_widget:
             self.video_widget = None
             
-        # 清理OpenCV播放器
-        if hasattr(self, 'opencv_player') and self.opencv_player:
-            self.opencv_player.cleanup()
-            self.opencv_player = None
+        # OpenCV播放器属于视频展示器，随展示器归还时停止
+        self.opencv_player = None
             
         # 清理嵌入式播放器
         if hasattr(self, 'embedded_player') and self.embedded_player:
             self.embedded_player.cleanup()
             self.embedded_player = None
             
-        # 清理Web视图
-        if hasattr(self, 'web_view') and self.web_view:
-            self.web_view = None
+        # Web视图属于网页展示器，随展示器归还时卸载页面
+        self.web_view = None
+        
+        if self.current_presenter is not None:
+            self.presenters.release(self.current_presenter)
+            self.current_presenter = None
             
-        # 清空布局
-        for i in reversed(range(self.content_layout.count())):
-            child = self.content_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
+        for widget in self.transient_widgets:
+            self.content_stack.removeWidget(widget)
+            widget.deleteLater()
+        self.transient_widgets = []
                 
     def keyPressEvent(self, event):
         """键盘事件处理"""
@@ -462,7 +625,9 @@ class ThreadedContentWindow(QWidget):
         """关闭窗口"""
         print(f"关闭屏幕 {self.screen_index + 1} 的线程窗口")
         
-        # 清理资源
+        # 清理资源，排队中的内容与未执行的加载步骤不再执行
+        self.command_queue.clear()
+        self._content_generation += 1
         self.clear_content()
         
         self.window_closed.emit(self.screen_index)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+缩略图服务
+在后台线程池中为图片生成缩小图、为视频提取封面帧，结果按文件内容指纹存入cache目录，
+界面线程只做O(1)的内存查找，未命中时返回None并在生成完成后发出信号，不阻塞界面
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+# 视频封面需要OpenCV，不可用时只生成图片缩略图
+try:
+    import cv2
+    VIDEO_THUMBNAILS_AVAILABLE = True
+except ImportError:
+    VIDEO_THUMBNAILS_AVAILABLE = False
+
+THUMBNAIL_DIR = os.path.join("cache", "thumbnails")
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tif', '.tiff'}
+
+
+def _fingerprint(path, sample=64 * 1024):
+    """文件内容指纹：大小 + 头尾各64KB，相同内容不同路径共用一份缩略图"""
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(str(size).encode('ascii'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(sample))
+        if size > sample * 2:
+            f.seek(-sample, os.SEEK_END)
+            digest.update(f.read(sample))
+    return digest.hexdigest()
+
+
+class _ThumbnailTask(QRunnable):
+    """线程池任务：读取磁盘缓存或生成缩略图"""
+
+    def __init__(self, service, key, path, max_size):
+        super().__init__()
+        self.service = service
+        self.key = key
+        self.path = path
+        self.max_size = max_size
+
+    def run(self):
+        image = None
+        origin = None   # "disk": 读自磁盘缓存，"generated": 新生成
+        try:
+            cache_file = os.path.join(self.service.directory, f"{_fingerprint(self.path)}_{self.max_size}.jpg")
+            if os.path.exists(cache_file):
+                image = QImage(cache_file)
+                origin = "disk"
+            if image is None or image.isNull():
+                origin = None
+                image = self._generate()
+                if image is not None and not image.isNull():
+                    os.makedirs(self.service.directory, exist_ok=True)
+                    image.save(cache_file, "JPG", 85)
+                    origin = "generated"
+        except Exception as e:
+            print(f"生成缩略图失败 {os.path.basename(self.path)}: {e}")
+            image = None
+            origin = None
+        self.service._finish(self.key, self.path, image, origin)
+
+    def _generate(self):
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext in IMAGE_EXTENSIONS:
+            # 按目标尺寸解码，大图不会整张展开到内存
+            reader = QImageReader(self.path)
+            reader.setAutoTransform(True)
+            size = reader.size()
+            if size.isValid():
+                reader.setScaledSize(size.scaled(self.max_size, self.max_size, Qt.KeepAspectRatio))
+            image = reader.read()
+            return image if not image.isNull() else None
+        if VIDEO_THUMBNAILS_AVAILABLE:
+            return self._video_frame()
+        return None
+
+    def _video_frame(self):
+        """取视频10%处的一帧作为封面（片头常为黑场）"""
+        cap = cv2.VideoCapture(self.path)
+        try:
+            if not cap.isOpened():
+                return None
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if frame_count > 10:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count // 10)
+            ret, frame = cap.read()
+            if not ret:
+                return None
+            height, width = frame.shape[:2]
+            scale = min(self.max_size / width, self.max_size / height, 1.0)
+            if scale < 1:
+                frame = cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))),
+                                   interpolation=cv2.INTER_AREA)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            height, width = frame.shape[:2]
+            return QImage(frame.data, width, height, frame.strides[0], QImage.Format_RGB888).copy()
+        finally:
+            cap.release()
+
+
+class ThumbnailService(QObject):
+    """进程内共享的缩略图服务"""
+
+    thumbnailReady = pyqtSignal(str)  # 文件路径，缩略图已可通过thumbnail()取得
+
+    def __init__(self, max_size=320, memory_entries=128, workers=2, directory=THUMBNAIL_DIR):
+        super().__init__()
+        self.max_size = max_size
+        self.memory_entries = memory_entries
+        self.directory = directory
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(workers)
+
+        self._lock = threading.Lock()
+        self._images = OrderedDict()   # (路径, 大小, 修改时间) -> QImage，None表示无法生成
+        self._pending = set()
+
+        # 统计信息
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.generated = 0
+
+    def _key(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime)
+
+    def thumbnail(self, path):
+        """取缩略图（界面线程调用）：命中返回QImage，否则排队生成并返回None"""
+        if not path:
+            return None
+        key = self._key(path)
+        if key is None:
+            return None
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                self.memory_hits += 1
+                return self._images[key]
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+        self.pool.start(_ThumbnailTask(self, key, path, self.max_size))
+        return None
+
+    def _finish(self, key, path, image, origin=None):
+        """工作线程完成：写入内存缓存并通知界面（跨线程信号自动排队到界面线程）"""
+        if image is not None and image.isNull():
+            image = None
+        with self._lock:
+            if origin == "disk":
+                self.disk_hits += 1
+            elif origin == "generated":
+                self.generated += 1
+            self._pending.discard(key)
+            self._images[key] = image
+            while len(self._images) > self.memory_entries:
+                self._images.popitem(last=False)
+        if image is not None:
+            self.thumbnailReady.emit(path)
+
+    def get_stats(self):
+        """获取缩略图统计"""
+        with self._lock:
+            return {
+                'thumbnail_entries': len(self._images),
+                'thumbnail_pending': len(self._pending),
+                'thumbnail_memory_hits': self.memory_hits,
+                'thumbnail_disk_hits': self.disk_hits,
+                'thumbnail_generated': self.generated,
+            }
+
+
+_service = None
+
+
+def thumbnail_service():
+    """缩略图服务单例（需在QApplication创建后使用）"""
+    global _service
+    if _service is None:
+        _service = ThumbnailService()
+    return _service
+
+
+__all__ = ['ThumbnailService', 'thumbnail_service', 'VIDEO_THUMBNAILS_AVAILABLE']
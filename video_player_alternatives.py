@@ -15,6 +15,8 @@ from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
 
+from media_probe import media_probe
+
 class VideoPlayerType:
     """视频播放器类型"""
     QT_NATIVE = "qt_native"
@@ -345,32 +347,17 @@ class AlternativeVideoPlayer(QWidget):
         return html
         
     def get_video_info(self, video_path):
-        """获取视频信息"""
+        """获取视频信息（媒体探测缓存命中时不再运行ffprobe）"""
         try:
-            # 尝试使用ffprobe获取视频信息
-            cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', video_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
-                
-                format_info = data.get('format', {})
-                duration = format_info.get('duration', 'Unknown')
-                format_name = format_info.get('format_name', 'Unknown')
+            info = media_probe.probe(video_path)
+            if info.get('codec'):
+                codec = info.get('codec', 'Unknown')
+                width = info.get('width', 'Unknown')
+                height = info.get('height', 'Unknown')
+                duration = info.get('duration', 'Unknown')
+                format_name = info.get('format_name', 'Unknown')
                 
-                video_stream = None
-                for stream in data.get('streams', []):
-                    if stream.get('codec_type') == 'video':
-                        video_stream = stream
-                        break
-                
-                if video_stream:
-                    codec = video_stream.get('codec_name', 'Unknown')
-                    width = video_stream.get('width', 'Unknown')
-                    height = video_stream.get('height', 'Unknown')
-                    
-                    return f"编码: {codec}\\n分辨率: {width}x{height}\\n时长: {duration}秒\\n格式: {format_name}"
+                return f"编码: {codec}\\n分辨率: {width}x{height}\\n时长: {duration}秒\\n格式: {format_name}"
                     
         except Exception as e:
             print(f"获取视频信息失败: {e}")
@@ -11,6 +11,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt, QRect, QTimer, pyqtSignal, QPoint
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QPixmap, QCursor
 from ui_styles_complete import PREVIEW_GROUP_STYLE, PREVIEW_WIDGET_STYLE
+from thumbnail_service import thumbnail_service
 
 class ScreenViewWidget(QWidget):
     """单个屏幕的视图组件，模拟真实屏幕"""
@@ -24,11 +25,13 @@ class ScreenViewWidget(QWidget):
         self.scale_factor = scale_factor
         self.content_type = "无内容"
         self.content_preview = ""
+        self.thumbnail = None  # 当前内容的缩略图，内容变化或生成完成时更新，绘制时不再查找
         self.is_selected = False
         self.is_primary = screen_info.get('is_primary', False)
         
         self.init_ui()
         self.setup_geometry()
+        thumbnail_service().thumbnailReady.connect(self.on_thumbnail_ready)
         
     def init_ui(self):
         """初始化屏幕视图界面"""
@@ -68,8 +71,20 @@ class ScreenViewWidget(QWidget):
                        f"内容: {self.content_type}")
         self.setToolTip(tooltip_text)
         
+        # 图片/视频内容在后台生成缩略图，完成后重绘
+        self.thumbnail = thumbnail_service().thumbnail(self.content_preview) if self.has_thumbnail_content() else None
         self.update()  # 触发重绘
         
+    def has_thumbnail_content(self):
+        """当前内容是否为可生成缩略图的文件"""
+        return self.content_type in ("图片", "视频", "拼接视频") and bool(self.content_preview)
+        
+    def on_thumbnail_ready(self, path):
+        """缩略图生成完成"""
+        if self.has_thumbnail_content() and path == self.content_preview:
+            self.thumbnail = thumbnail_service().thumbnail(self.content_preview)
+            self.update()
+        
     def set_selected(self, selected):
         """设置选中状态"""
         self.is_selected = selected
@@ -99,6 +114,9 @@ class ScreenViewWidget(QWidget):
         elif self.content_type == "视频":
             bg_color = QColor(231, 76, 60, 180)   # 红色
             border_color = QColor(192, 57, 43)
+        elif self.content_type == "拼接视频":
+            bg_color = QColor(230, 126, 34, 180)  # 橙色
+            border_color = QColor(211, 84, 0)
         elif self.content_type == "网页":
             bg_color = QColor(155, 89, 182, 180)  # 紫色
             border_color = QColor(142, 68, 173)
@@ -117,6 +135,20 @@ class ScreenViewWidget(QWidget):
         painter.setBrush(QBrush(bg_color))
         painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 6, 6)
         
+        # 绘制内容缩略图（未生成时保持纯色背景）
+        thumbnail = self.thumbnail
+        if thumbnail is not None:
+            inner = rect.adjusted(3, 3, -3, -3)
+            # 等比铺满屏幕区域，居中裁剪
+            scaled = thumbnail.size().scaled(inner.size(), Qt.KeepAspectRatioByExpanding)
+            crop_w = int(thumbnail.width() * inner.width() / max(1, scaled.width()))
+            crop_h = int(thumbnail.height() * inner.height() / max(1, scaled.height()))
+            source = QRect((thumbnail.width() - crop_w) // 2, (thumbnail.height() - crop_h) // 2, crop_w, crop_h)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(inner, thumbnail, source)
+            # 半透明内容色蒙层，保持类型颜色可辨认
+            painter.fillRect(inner, QColor(bg_color.red(), bg_color.green(), bg_color.blue(), 70))
+        
         # 绘制屏幕编号
         painter.setPen(QPen(QColor(255, 255, 255), 1))
         painter.setFont(QFont("Arial", 10, QFont.Bold))
@@ -148,6 +180,7 @@ class ScreenViewWidget(QWidget):
             "文本": "📝",
             "图片": "🖼️",
             "视频": "🎬",
+            "拼接视频": "🧩",
             "网页": "🌐"
         }
         return icons.get(self.content_type, "")
@@ -816,7 +849,7 @@ class ViewConfigManager(QWidget):
                 outline: none;
             }
         """)
-        content_type_combo.addItems(["无内容", "文本", "图片", "视频", "网页"])
+        content_type_combo.addItems(["无内容", "文本", "图片", "视频", "拼接视频", "网页"])
         
         type_layout.addWidget(content_type_label)
         type_layout.addWidget(content_type_combo, 1)
@@ -1007,6 +1040,8 @@ class ViewConfigManager(QWidget):
                         screen_item.setBackground(QColor(52, 152, 219, 100))
                     elif content_type == "视频":
                         screen_item.setBackground(QColor(231, 76, 60, 100))
+                    elif content_type == "拼接视频":
+                        screen_item.setBackground(QColor(230, 126, 34, 100))
                     elif content_type == "网页":
                         screen_item.setBackground(QColor(155, 89, 182, 100))
                 else:
@@ -1193,13 +1228,21 @@ class ViewConfigManager(QWidget):
                 preview_text = f"🖼️ 图片\n{os.path.basename(content) if content else '无文件'}"
             elif content_type == "视频":
                 preview_text = f"🎬 视频\n{os.path.basename(content) if content else '无文件'}"
+            elif content_type == "拼接视频":
+                preview_text = f"🧩 拼接视频\n{os.path.basename(content) if content else '无文件'}"
             elif content_type == "网页":
                 preview_text = f"🌐 网页\n{content[:15]}..." if len(content) > 15 else f"🌐 {content}"
             else:
                 preview_text = "⭕ 无内容"
             
             preview_label.setText(preview_text)
-            preview_label.resize(screen_widget.size())
+            if content_type in ("图片", "视频", "拼接视频"):
+                # 文件内容由屏幕视图绘制缩略图，文字只占底部一条
+                band_height = min(screen_widget.height(), 30)
+                preview_label.setGeometry(0, screen_widget.height() - band_height, screen_widget.width(), band_height)
+                thumbnail_service().thumbnail(content)
+            else:
+                preview_label.resize(screen_widget.size())
             preview_label.show()
             
             # 保存预览标签的引用，以便清理
@@ -1771,6 +1814,7 @@ class ViewConfigManager(QWidget):
             ("📝 文本", "#2ecc71"),
             ("🖼️ 图片", "#3498db"), 
             ("🎬 视频", "#e74c3c"),
+            ("🧩 拼接视频", "#e67e22"),
             ("🌐 网页", "#9b59b6"),
             ("⭕ 无内容", "#34495e")
         ]